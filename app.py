@@ -1,6 +1,9 @@
 import os
 from dashboard import app
 
+# WSGI entry point for gunicorn (see gunicorn.conf.py)
+server = app.server
+
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 8050))
     app.run(debug=False, host="0.0.0.0", port=port)
@@ -0,0 +1,46 @@
+import argparse
+import json
+import time
+from utils.dataset import load_comparison_data
+from components.backtest import WEIGHT_SETTINGS, run_backtest
+from components.player_filters import FILTERS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest how well physical comps from earlier draft classes predict NBA minutes.")
+    parser.add_argument("--years", type=int, nargs="+", default=None, help="draft classes to test (default: all but the first)")
+    parser.add_argument("--setting", action="append", choices=list(WEIGHT_SETTINGS), default=[], help="weight setting to test, repeatable (default: all)")
+    parser.add_argument("--weights-json", default=None, help="JSON file of extra settings, {name: {feature: weight}}")
+    parser.add_argument("-k", type=int, default=6, help="comps per player")
+    parser.add_argument("--filter", action="append", choices=list(FILTERS), default=[], help="restrict the comp pool, repeatable")
+    parser.add_argument("--drop-missing", action="store_true", help="leave out players without NBA minutes instead of counting them as zero")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (1 runs in-process)")
+    parser.add_argument("--out", default="backtest_by_year.csv", help="per-class scores")
+    parser.add_argument("--predictions", default=None, help="also write per-player predictions here")
+    parser.add_argument("--artifact", default=None, help="dataset artifact to load")
+    args = parser.parse_args()
+
+    settings = {name: WEIGHT_SETTINGS[name] for name in args.setting} or dict(WEIGHT_SETTINGS)
+    if args.weights_json:
+        with open(args.weights_json) as f:
+            settings.update(json.load(f))
+
+    data = load_comparison_data(args.artifact)
+
+    start = time.perf_counter()
+    by_year, summary, predictions = run_backtest(
+        data, years=args.years, settings=settings, k=args.k, filters=args.filter,
+        missing_minutes=None if args.drop_missing else 0.0, workers=args.workers,
+    )
+    elapsed = time.perf_counter() - start
+
+    by_year.to_csv(args.out, index=False)
+    if args.predictions:
+        predictions.to_csv(args.predictions, index=False)
+
+    print(f"Backtested {by_year['year'].nunique()} classes x {len(settings)} settings in {elapsed:.2f}s")
+    print(summary.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report, {(r['size'], r['benchmark']): r for r in report['results']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.10, help='slowdown ratio counted as a regression')
+    args = parser.parse_args()
+
+    base_report, baseline = load(args.baseline)
+    cand_report, candidate = load(args.candidate)
+    print(f"baseline {base_report.get('commit')}  candidate {cand_report.get('commit')}")
+
+    regressions = 0
+    for key in sorted(set(baseline) & set(candidate)):
+        before, after = baseline[key]['median_s'], candidate[key]['median_s']
+        change = (after - before) / before if before else 0.0
+        flag = ''
+        if change > args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{key[0]:>9} {key[1]:<28} {before * 1000:10.2f} -> {after * 1000:10.2f} ms ({change:+.1%}){flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+import argparse
+import json
+import math
+import platform
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+import requests
+
+from benchmarks.run import _git_commit
+from components.player_filters import FILTERS
+from utils.player_loader import load_custom_players, PREFILL_COLUMNS
+
+# Load generator for a running dashboard. It replays the requests the browser
+# sends when a scout clicks "Find Closest Players" (the calculate_and_display
+# callback on /_dash-update-component) and, optionally, JSON API lookups.
+# Selecting a prospect only prefills the inputs in the browser (a clientside
+# callback), so it shows up here as a click carrying that prospect's name and
+# measurements rather than a request of its own.
+#
+#   python app.py   (or gunicorn -c gunicorn.conf.py app:server)
+#   python -m benchmarks.loadtest --concurrency 16 --requests 2000 --label single
+#
+# The request sequence only depends on --seed, so runs against different
+# server configurations replay exactly the same work.
+
+CALCULATE_OUTPUTS = [
+    ("closest-players-output-content", "children"),
+    ("averaged-metrics-output-averages", "children"),
+    ("averaged-metrics-output-graphs", "children"),
+]
+INPUT_IDS = ["height-input", "wingspan-input", "reach-input", "hand-length-input", "hand-width-input"]
+API_PARAMS = ["height", "wingspan", "reach", "hand_length", "hand_width"]
+
+# Mean and spread of manually typed measurements, roughly the combine's
+MANUAL_MEASUREMENTS = [(78.5, 3.2), (82.5, 3.8), (104.5, 4.5), (8.7, 0.45), (9.4, 0.7)]
+
+
+def calculate_payload(player_name, values, filters, n_clicks=1):
+    state = [{"id": "utah-player-dropdown", "property": "value", "value": player_name}]
+    state += [{"id": input_id, "property": "value", "value": value} for input_id, value in zip(INPUT_IDS, values)]
+    state.append({"id": "filter-checklist", "property": "value", "value": filters})
+    return {
+        "output": ".." + "...".join(f"{component}.{prop}" for component, prop in CALCULATE_OUTPUTS) + "..",
+        "outputs": [{"id": component, "property": prop} for component, prop in CALCULATE_OUTPUTS],
+        "inputs": [{"id": "submit-button", "property": "n_clicks", "value": n_clicks}],
+        "state": state,
+        "changedPropIds": ["submit-button.n_clicks"],
+    }
+
+
+def _value(value):
+    return None if value is None or (isinstance(value, float) and math.isnan(value)) else float(value)
+
+
+def build_requests(n, prospects, seed=0, prospect_share=0.5, api_share=0.0):
+    # Returns a list of (kind, method, path, json body or query params)
+    rng = random.Random(seed)
+    names = prospects['Player'].tolist()
+    prefill = {name: [_value(v) for v in row] for name, row in
+               zip(names, prospects[PREFILL_COLUMNS].itertuples(index=False))}
+    filter_values = list(FILTERS)
+
+    planned = []
+    for i in range(n):
+        filters = [value for value in filter_values if rng.random() < 0.3]
+        if names and rng.random() < prospect_share:
+            player_name = rng.choice(names)
+            values = prefill[player_name]
+        else:
+            player_name = None
+            values = [round(rng.gauss(mean, sd) * 4) / 4 for mean, sd in MANUAL_MEASUREMENTS]
+
+        if rng.random() < api_share:
+            # The API needs all five measurements; the dashboard just ignores such a click
+            if None in values:
+                values = [round(rng.gauss(mean, sd) * 4) / 4 for mean, sd in MANUAL_MEASUREMENTS]
+            params = dict(zip(API_PARAMS, values), k=6)
+            if filters:
+                params['filters'] = ",".join(filters)
+            planned.append(("api_similar", "GET", "/api/similar", params))
+        else:
+            kind = "calculate_prospect" if player_name else "calculate_manual"
+            planned.append((kind, "POST", "/_dash-update-component", calculate_payload(player_name, values, filters, i + 1)))
+    return planned
+
+
+def wait_until_ready(url, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if requests.get(url + "/readyz", timeout=5).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        if time.monotonic() > deadline:
+            raise SystemExit(f"{url} did not become ready within {timeout}s")
+        time.sleep(0.5)
+
+
+def run_load(url, planned, concurrency, timeout=30):
+    # Workers pull from a shared queue, so throughput is bounded by the
+    # server and not by how the requests were split up front.
+    # Returns [(kind, start offset, seconds, status or None)] in request order.
+    jobs = queue.Queue()
+    for i, job in enumerate(planned):
+        jobs.put((i, job))
+    samples = [None] * len(planned)
+    start = time.perf_counter()
+
+    def worker():
+        session = requests.Session()
+        while True:
+            try:
+                i, (kind, method, path, body) = jobs.get_nowait()
+            except queue.Empty:
+                return
+            sent = time.perf_counter()
+            try:
+                if method == "GET":
+                    response = session.get(url + path, params=body, timeout=timeout)
+                else:
+                    response = session.post(url + path, json=body, timeout=timeout)
+                status = response.status_code
+            except requests.RequestException:
+                status = None
+            samples[i] = (kind, sent - start, time.perf_counter() - sent, status)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+SUMMARY_TIMINGS = ['throughput_rps', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']
+
+
+def summarize(samples, elapsed):
+    # Same keys with or without samples; the timings are None without any
+    latencies = np.array([s[2] for s in samples])
+    errors = sum(1 for s in samples if s[3] != 200)
+    if not len(latencies):
+        return dict({'requests': 0, 'errors': 0, 'error_rate': 0.0}, **dict.fromkeys(SUMMARY_TIMINGS))
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': errors / len(samples),
+        'throughput_rps': len(samples) / elapsed if elapsed else None,
+        'mean_ms': latencies.mean() * 1000,
+        'p50_ms': p50 * 1000,
+        'p95_ms': p95 * 1000,
+        'p99_ms': p99 * 1000,
+        'max_ms': latencies.max() * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay dashboard requests against a running app and report latency.")
+    parser.add_argument('--url', default='http://127.0.0.1:8050')
+    parser.add_argument('--concurrency', type=int, default=8, help='simultaneous scouts')
+    parser.add_argument('--requests', type=int, default=1000, help='measured requests')
+    parser.add_argument('--warmup', type=int, default=50, help='unmeasured requests sent first')
+    parser.add_argument('--prospects', default='utah_players.csv')
+    parser.add_argument('--prospect-share', type=float, default=0.5, help='share of clicks with a selected prospect')
+    parser.add_argument('--api-share', type=float, default=0.0, help='share of requests sent to /api/similar')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout in seconds')
+    parser.add_argument('--label', default=None, help='name of the server configuration under test')
+    parser.add_argument('--out', default='loadtest_results.json')
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/')
+    wait_until_ready(url, timeout=300)
+
+    prospects = load_custom_players(args.prospects)
+    planned = build_requests(args.warmup + args.requests, prospects, args.seed,
+                             args.prospect_share, args.api_share)
+
+    if args.warmup:
+        run_load(url, planned[:args.warmup], args.concurrency, args.timeout)
+    samples, elapsed = run_load(url, planned[args.warmup:], args.concurrency, args.timeout)
+
+    overall = summarize(samples, elapsed)
+    by_kind = {}
+    for kind in sorted({s[0] for s in samples}):
+        by_kind[kind] = summarize([s for s in samples if s[0] == kind], elapsed)
+
+    print(f"{args.label or url}: {overall['requests']} requests at concurrency {args.concurrency} in {elapsed:.1f}s")
+    for kind, summary in [('overall', overall)] + list(by_kind.items()):
+        if not summary['requests']:
+            print(f"  {kind:<20} no requests")
+            continue
+        rps = f"{summary['throughput_rps']:8.1f}" if summary['throughput_rps'] is not None else f"{'-':>8}"
+        print(f"  {kind:<20} {rps} req/s  p50 {summary['p50_ms']:8.1f}  "
+              f"p95 {summary['p95_ms']:8.1f}  p99 {summary['p99_ms']:8.1f} ms  errors {summary['error_rate']:.2%}")
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'label': args.label,
+        'url': url,
+        'concurrency': args.concurrency,
+        'seed': args.seed,
+        'warmup': args.warmup,
+        'prospect_share': args.prospect_share,
+        'api_share': args.api_share,
+        'elapsed_s': elapsed,
+        'overall': overall,
+        'by_kind': by_kind,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote results to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import plotly
+
+from benchmarks.synthetic import generate, generate_prospects
+from utils.data_cleaner import clean_and_merge
+from utils.player_keys import KeyTables, join_draft_and_minutes
+from utils.artifact import write_artifact
+from components.distance_calculator import SimilarityIndex, calculate_player_distances
+
+DEFAULT_SIZES = [1500, 15000, 150000, 1000000]
+FILTER_SETS = [[], ['was_drafted'], ['first_round', 'significant_minutes']]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def timeit(fn, repeat):
+    # Returns (timings, last result); one untimed warm-up call first
+    result = fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def record(results, size, name, timings, **extra):
+    entry = {
+        'size': size,
+        'benchmark': name,
+        'repeat': len(timings),
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'max_s': max(timings),
+    }
+    entry.update(extra)
+    results.append(entry)
+    print(f"{size:>9} {name:<28} median {entry['median_s'] * 1000:10.2f} ms")
+
+
+def run_size(size, repeat, queries, results):
+    anthro, drill, playerStats, playerMinutes = generate(size)
+    prospects = generate_prospects(queries)
+    points = prospects.to_dict('records')
+
+    # Expensive stages run fewer times at large sizes
+    slow_repeat = max(1, repeat // 3) if size >= 100000 else repeat
+
+    timings, merged_df = timeit(lambda: clean_and_merge(anthro, drill), slow_repeat)
+    record(results, size, 'clean_and_merge', timings, rows=len(merged_df))
+
+    timings, tables = timeit(lambda: KeyTables(playerStats, playerMinutes), slow_repeat)
+    record(results, size, 'key_tables', timings)
+
+    timings, (final_df, _) = timeit(lambda: join_draft_and_minutes(merged_df, tables), slow_repeat)
+    record(results, size, 'join_draft_and_minutes', timings, rows=len(final_df))
+
+    timings, index = timeit(lambda: SimilarityIndex.from_frame(final_df), slow_repeat)
+    record(results, size, 'similarity_index_build', timings)
+
+    timings, _ = timeit(lambda: calculate_player_distances(final_df, points[0], top_k=6), slow_repeat)
+    record(results, size, 'calculate_player_distances', timings)
+
+    i = iter(range(10 ** 9))
+    timings, _ = timeit(lambda: index.query(points[next(i) % len(points)], k=6), repeat * 10)
+    record(results, size, 'index_query', timings)
+
+    return final_df, index, prospects
+
+
+def run_end_to_end(size, final_df, index, prospects, repeat, results):
+    # Load the synthetic data through the same artifact path the app uses and
+    # call the Dash callback directly
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        write_artifact(final_df, index, artifact_dir)
+        os.environ['NBA_COMBINE_ARTIFACT'] = artifact_dir
+        if 'dashboard' in sys.modules:
+            dashboard = importlib.reload(sys.modules['dashboard'])
+        else:
+            dashboard = importlib.import_module('dashboard')
+        # The dashboard loads its data in the background
+        if not dashboard.data_store.wait(600):
+            raise RuntimeError(f"dashboard failed to load the benchmark artifact: {dashboard.data_store.error!r}")
+
+    calls = []
+    for i, row in enumerate(prospects.itertuples(index=False)):
+        calls.append((1, None, row.HEIGHT_WO_SHOES, row.WINGSPAN, row.STANDING_REACH,
+                      row.HAND_LENGTH, row.HAND_WIDTH, FILTER_SETS[i % len(FILTER_SETS)]))
+    calls.append((1, dashboard.utah_players['Player'].iloc[1], 79.5, 83, 105, 9, 8.75, []))
+
+    i = iter(range(10 ** 9))
+    payload_bytes = []
+
+    def click():
+        outputs = dashboard.calculate_and_display(*calls[next(i) % len(calls)])
+        payload_bytes.append(len(json.dumps(outputs, cls=plotly.utils.PlotlyJSONEncoder)))
+
+    timings, _ = timeit(click, repeat * 3)
+    record(results, size, 'calculate_and_display', timings,
+           payload_bytes=int(statistics.median(payload_bytes)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data pipeline and similarity search on synthetic combine data.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='number of synthetic players')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--queries', type=int, default=50, help='distinct query prospects')
+    parser.add_argument('--no-end-to-end', action='store_true', help='skip the calculate_and_display benchmark')
+    parser.add_argument('--out', default='bench_results.json')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        final_df, index, prospects = run_size(size, args.repeat, args.queries, results)
+        if not args.no_end_to_end:
+            run_end_to_end(size, final_df, index, prospects, args.repeat, results)
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+from utils.data_downloader import season_label
+
+# Column layouts of the stats.nba.com combine endpoints and the local CSVs
+ANTHRO_HEADERS = ['TEMP_PLAYER_ID', 'PLAYER_ID', 'FIRST_NAME', 'LAST_NAME', 'PLAYER_NAME', 'POSITION',
+                  'HEIGHT_WO_SHOES', 'HEIGHT_WO_SHOES_FT_IN', 'HEIGHT_W_SHOES', 'HEIGHT_W_SHOES_FT_IN',
+                  'WEIGHT', 'WINGSPAN', 'WINGSPAN_FT_IN', 'STANDING_REACH', 'STANDING_REACH_FT_IN',
+                  'BODY_FAT_PCT', 'HAND_LENGTH', 'HAND_WIDTH']
+DRILL_HEADERS = ['TEMP_PLAYER_ID', 'PLAYER_ID', 'FIRST_NAME', 'LAST_NAME', 'PLAYER_NAME', 'POSITION',
+                 'LANE_AGILITY_TIME', 'MODIFIED_LANE_AGILITY_TIME', 'THREE_QUARTER_SPRINT',
+                 'STANDING_VERTICAL_LEAP', 'MAX_VERTICAL_LEAP', 'BENCH_PRESS']
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'PG-SG', 'SG-SF', 'SF-PF', 'PF-C']
+FIRST_NAMES = ['Marcus', 'Justin', 'Dario', 'Nikola', "De'Aaron", 'A.J.', 'Luka', 'Jaren', 'Kelly', 'Bogdan']
+SUFFIXES = ['', '', '', '', '', '', ' Jr.', ' II', ' III']
+
+
+def _ft_in(inches):
+    feet = (inches // 12).astype(int).astype(str)
+    rest = np.round(inches % 12, 2).astype(str)
+    return np.char.add(np.char.add(feet, "' "), np.char.add(rest, '"'))
+
+
+def _with_gaps(rng, values, missing_rate, string_rate=0.0):
+    # Missing measurements as None and, like some API rows, numbers sent as strings
+    values = values.astype(object)
+    values[rng.random(len(values)) < missing_rate] = None
+    as_string = (rng.random(len(values)) < string_rate) & pd.notna(values)
+    values[as_string] = [f"{v:.2f}" for v in values[as_string]]
+    return values
+
+
+def generate(n_players, first_year=2000, last_year=2024, repeat_rate=0.05, seed=0):
+    # Returns (anthro_data_all, drill_data_all, playerStats, playerMinutes) shaped
+    # like the downloaded seasons and draft_players.csv / minutes_per_player.csv
+    rng = np.random.default_rng(seed)
+    years = np.arange(first_year, last_year + 1)
+
+    ids = np.arange(n_players)
+    names = np.array([
+        f"{FIRST_NAMES[i % len(FIRST_NAMES)]} Player{i:07d}{SUFFIXES[i % len(SUFFIXES)]}" for i in ids
+    ], dtype=object)
+    first_season = rng.integers(0, len(years), n_players)
+
+    # A few players attend a second combine the following year
+    repeat = ids[(rng.random(n_players) < repeat_rate) & (first_season < len(years) - 1)]
+    row_player = np.concatenate([ids, repeat])
+    row_season = np.concatenate([first_season, first_season[repeat] + 1])
+    n_rows = len(row_player)
+
+    height = rng.normal(78, 3.5, n_players)[row_player] + rng.normal(0, 0.25, n_rows)
+    wingspan = height + rng.normal(5, 2, n_rows)
+    reach = height * 1.33 + rng.normal(0, 1.5, n_rows)
+    player_names = names[row_player]
+
+    anthro = pd.DataFrame({
+        'TEMP_PLAYER_ID': row_player,
+        'PLAYER_ID': row_player + 1600000,
+        'FIRST_NAME': [n.split(' ')[0] for n in player_names],
+        'LAST_NAME': [n.split(' ', 1)[1] for n in player_names],
+        'PLAYER_NAME': player_names,
+        'POSITION': np.array(POSITIONS)[rng.integers(0, len(POSITIONS), n_rows)],
+        'HEIGHT_WO_SHOES': _with_gaps(rng, height, 0.01, 0.05),
+        'HEIGHT_WO_SHOES_FT_IN': _ft_in(height),
+        'HEIGHT_W_SHOES': _with_gaps(rng, height + 1.25, 0.3),
+        'HEIGHT_W_SHOES_FT_IN': _ft_in(height + 1.25),
+        'WEIGHT': _with_gaps(rng, rng.normal(215, 20, n_rows), 0.02, 0.5),
+        'WINGSPAN': _with_gaps(rng, wingspan, 0.01, 0.05),
+        'WINGSPAN_FT_IN': _ft_in(wingspan),
+        'STANDING_REACH': _with_gaps(rng, reach, 0.01, 0.05),
+        'STANDING_REACH_FT_IN': _ft_in(reach),
+        'BODY_FAT_PCT': _with_gaps(rng, rng.normal(7, 2, n_rows), 0.2),
+        'HAND_LENGTH': _with_gaps(rng, np.round(rng.normal(8.7, 0.4, n_rows) * 4) / 4, 0.3),
+        'HAND_WIDTH': _with_gaps(rng, np.round(rng.normal(9.4, 0.6, n_rows) * 4) / 4, 0.3),
+    })
+    drill = pd.DataFrame({
+        'TEMP_PLAYER_ID': row_player,
+        'PLAYER_ID': row_player + 1600000,
+        'FIRST_NAME': anthro['FIRST_NAME'],
+        'LAST_NAME': anthro['LAST_NAME'],
+        'PLAYER_NAME': player_names,
+        'POSITION': anthro['POSITION'],
+        'LANE_AGILITY_TIME': _with_gaps(rng, rng.normal(11.3, 0.5, n_rows), 0.4),
+        'MODIFIED_LANE_AGILITY_TIME': _with_gaps(rng, rng.normal(3.1, 0.2, n_rows), 0.6),
+        'THREE_QUARTER_SPRINT': _with_gaps(rng, rng.normal(3.3, 0.1, n_rows), 0.4),
+        'STANDING_VERTICAL_LEAP': _with_gaps(rng, rng.normal(29, 3, n_rows), 0.4),
+        'MAX_VERTICAL_LEAP': _with_gaps(rng, rng.normal(34, 3, n_rows), 0.4),
+        'BENCH_PRESS': _with_gaps(rng, rng.integers(0, 20, n_rows).astype(float), 0.7),
+    })
+
+    anthro_data_all, drill_data_all = [], []
+    for i, year in enumerate(years):
+        in_season = row_season == i
+        season = season_label(year)
+        anthro_data_all.append(anthro[in_season].reset_index(drop=True).assign(Season=season))
+        drill_data_all.append(drill[in_season].reset_index(drop=True).assign(Season=season))
+
+    # About 60% of combine players are drafted in their combine year
+    drafted = ids[rng.random(n_players) < 0.6]
+    draft_year = years[first_season[drafted]]
+    playerStats = pd.DataFrame({
+        'Player': names[drafted],
+        'Pick': (rng.integers(1, 61, len(drafted))).astype(str),
+        'Minutes Played': _with_gaps(rng, rng.normal(18, 8, len(drafted)), 0.2),
+        'DraftYear': draft_year,
+    })
+    # draft_players.csv repeats its header rows inside every draft year
+    header_rows = pd.DataFrame({
+        'Player': ['Round 2', 'Player'] * len(years),
+        'Pick': [None, 'Pk'] * len(years),
+        'Minutes Played': ['Per Game', 'MP'] * len(years),
+        'DraftYear': np.repeat(years, 2),
+    })
+    playerStats = pd.concat([playerStats, header_rows], ignore_index=True)
+
+    played = drafted[rng.random(len(drafted)) < 0.8]
+    playerMinutes = pd.DataFrame({
+        'Player': names[played],
+        'MP': np.round(np.clip(rng.normal(16, 9, len(played)), 0.5, 40), 1),
+        'Season': years[first_season[played]],
+    })
+
+    return anthro_data_all, drill_data_all, playerStats, playerMinutes
+
+
+def generate_prospects(n, seed=1):
+    # Prospect rows in the utah_players.csv schema, drills left blank
+    rng = np.random.default_rng(seed)
+    height = rng.normal(78, 3.5, n)
+    return pd.DataFrame({
+        'Player': [f"Prospect {i}" for i in range(n)],
+        'HEIGHT_WO_SHOES': np.round(height * 4) / 4,
+        'WEIGHT': np.round(rng.normal(215, 20, n), 1),
+        'WINGSPAN': np.round((height + rng.normal(5, 2, n)) * 4) / 4,
+        'STANDING_REACH': np.round(height * 1.33 + rng.normal(0, 1.5, n)),
+        'HAND_LENGTH': np.round(rng.normal(8.7, 0.4, n) * 4) / 4,
+        'HAND_WIDTH': np.round(rng.normal(9.4, 0.6, n) * 4) / 4,
+        'STANDING_VERTICAL_LEAP': np.nan,
+        'MAX_VERTICAL_LEAP': np.nan,
+        'LANE_AGILITY_TIME': np.nan,
+        'MODIFIED_LANE_AGILITY_TIME': np.nan,
+        'THREE_QUARTER_SPRINT': np.nan,
+        'BENCH_PRESS': np.nan,
+    })
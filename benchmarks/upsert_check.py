@@ -0,0 +1,101 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import generate, generate_prospects
+from components.player_filters import FILTERS
+from utils.compact import decode_rows
+from utils.data_cleaner import clean_and_merge
+from utils.dataset import ComparisonData
+from utils.player_keys import KeyTables, join_draft_and_minutes
+from utils.season_update import upsert_season
+
+# Regression check for season upserts: folds the last synthetic season into a
+# dataset built without it and compares the result with a full rebuild over
+# every season. Exits non-zero when they disagree.
+#
+#   python -m benchmarks.upsert_check --size 150000
+
+
+def _order(data):
+    # Row order of the full rebuild differs from the upsert's (kept rows first)
+    return np.lexsort((data.final_df['Season'].astype(str).to_numpy(),
+                       data.final_df['PLAYER_NAME'].astype(str).to_numpy()))
+
+
+def compare(upserted, rebuilt, points, rtol=1e-4):
+    # Returns a list of differences, empty when the two datasets agree
+    problems = []
+    a, b = _order(upserted), _order(rebuilt)
+
+    frame_a = decode_rows(upserted.final_df.iloc[a]).reset_index(drop=True).astype(object)
+    frame_b = decode_rows(rebuilt.final_df.iloc[b]).reset_index(drop=True).astype(object)
+    if not frame_a.where(frame_a.notna(), None).equals(frame_b.where(frame_b.notna(), None)):
+        problems.append("frames differ")
+
+    index_a, index_b = upserted.index, rebuilt.index
+    if not (np.allclose(index_a.mean, index_b.mean, rtol=rtol) and np.allclose(index_a.scale, index_b.scale, rtol=rtol)):
+        problems.append("index mean or scale differ")
+    if not np.allclose(index_a.scaled[a], index_b.scaled[b], rtol=rtol, atol=1e-4, equal_nan=True):
+        problems.append("scaled feature blocks differ")
+
+    for value in FILTERS:
+        if not np.array_equal(upserted.filter_masks[value][a], rebuilt.filter_masks[value][b]):
+            problems.append(f"filter mask {value} differs")
+        # Distances to the k-th comp, with and without pushdown to the partitions
+        d_a = upserted.query_many(points, k=6, filters=[value])[1]
+        d_b = rebuilt.query_many(points, k=6, filters=[value])[1]
+        if not np.allclose(d_a, d_b, rtol=rtol, atol=1e-4):
+            problems.append(f"comp distances with filter {value} differ")
+
+    if set(upserted.percentiles.tables) != set(rebuilt.percentiles.tables):
+        problems.append("percentile groups differ")
+    for group, table in rebuilt.percentiles.tables.items():
+        for feature, history in table.items():
+            if not np.array_equal(upserted.percentiles.tables.get(group, {}).get(feature), history):
+                problems.append(f"percentile table {group}/{feature} differs")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that a season upsert matches a full rebuild.")
+    parser.add_argument('--size', type=int, default=15000, help='number of synthetic players')
+    parser.add_argument('--queries', type=int, default=50, help='query prospects compared')
+    args = parser.parse_args()
+
+    anthro, drill, playerStats, playerMinutes = generate(args.size)
+    tables = KeyTables(playerStats, playerMinutes)
+    season = anthro[-1]['Season'].iloc[0]
+
+    base_df, _ = join_draft_and_minutes(clean_and_merge(anthro[:-1], drill[:-1]), tables, with_report=False)
+    base = ComparisonData(base_df, version='base')
+
+    start = time.perf_counter()
+    upserted = upsert_season(base, anthro[-1].drop(columns='Season'), drill[-1].drop(columns='Season'), season, tables)
+    upsert_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    full_df, _ = join_draft_and_minutes(clean_and_merge(anthro, drill), tables, with_report=False)
+    rebuilt = ComparisonData(full_df, version='full')
+    rebuild_s = time.perf_counter() - start
+
+    points = generate_prospects(args.queries)
+    problems = compare(upserted, rebuilt, points)
+
+    # Loading the same season again must be a no-op
+    again = upsert_season(upserted, anthro[-1].drop(columns='Season'), drill[-1].drop(columns='Season'), season, tables)
+    if again is not upserted:
+        problems.append("reloading an unchanged season built a new version")
+
+    print(f"{args.size} players, season {season}: upsert {upsert_s:.2f}s, full rebuild {rebuild_s:.2f}s")
+    for problem in problems:
+        print(f"  MISMATCH: {problem}")
+    if problems:
+        sys.exit(1)
+    print("  upsert matches the full rebuild")
+
+
+if __name__ == '__main__':
+    main()
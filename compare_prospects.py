@@ -0,0 +1,28 @@
+import argparse
+from utils.dataset import load_comparison_data
+from utils.player_loader import load_custom_players
+from components.batch_compare import compare_prospects, write_report
+from components.player_filters import FILTERS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the closest combine comps for every prospect in a CSV.")
+    parser.add_argument("prospects", nargs="?", default="utah_players.csv", help="prospect CSV in the utah_players.csv schema")
+    parser.add_argument("--out", default="prospect_comps.csv", help="report path (.csv or .parquet)")
+    parser.add_argument("-k", type=int, default=6, help="comps per prospect")
+    parser.add_argument("--filter", action="append", choices=list(FILTERS), default=[], help="filter to apply, repeatable")
+    parser.add_argument("--chunk-size", type=int, default=256, help="prospects scored per matrix operation")
+    parser.add_argument("--artifact", default=None, help="dataset artifact to load")
+    args = parser.parse_args()
+
+    data = load_comparison_data(args.artifact)
+    prospects = load_custom_players(args.prospects)
+
+    report = compare_prospects(data, prospects, k=args.k, filters=args.filter, chunk_size=args.chunk_size)
+    write_report(report, args.out)
+
+    print(f"Wrote {len(report)} comps for {report['Prospect'].nunique()} prospects to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from components.distance_calculator import FEATURES, DEFAULT_WEIGHTS, SimilarityIndex
+from components.player_filters import combine_masks
+
+TARGET = 'Minutes Played Per Game'
+
+# Feature-weight settings compared by default; missing features fall back to
+# DEFAULT_WEIGHTS and a weight of 0 leaves the feature out
+WEIGHT_SETTINGS = {
+    'default': DEFAULT_WEIGHTS,
+    'equal': {f: 1.0 for f in DEFAULT_WEIGHTS},
+    'measurements_only': {f: (1.0 if f in FEATURES else 0.0) for f in DEFAULT_WEIGHTS},
+    'no_drills': {f: (DEFAULT_WEIGHTS[f] if f in FEATURES + ['WEIGHT'] else 0.0) for f in DEFAULT_WEIGHTS},
+}
+
+# Read-only state shared with the worker processes. With the fork start method
+# the initializer arguments are inherited rather than pickled, so every worker
+# reads the parent's feature matrix without copying it.
+_shared = {}
+
+
+def _init_worker(index, class_years, minutes, pool_mask):
+    _shared.update(index=index, class_years=class_years, minutes=minutes, pool_mask=pool_mask)
+
+
+def _backtest_class(year, settings, k, chunk_size=256):
+    # Comps for one draft class against every earlier class, under each
+    # (setting, weight vector) in `settings`. Returns a list of
+    # (year, setting, query positions, predicted minutes, pool baseline).
+    index, class_years, minutes = _shared['index'], _shared['class_years'], _shared['minutes']
+
+    queries = np.flatnonzero((class_years == year) & ~np.isnan(minutes))
+    pool = class_years < year
+    if _shared['pool_mask'] is not None:
+        pool &= _shared['pool_mask']
+    pool &= ~np.isnan(minutes)
+    if not len(queries) or not pool.any():
+        return [(year, setting, queries[:0], np.empty(0), np.nan) for setting, _ in settings]
+
+    # Standardized with the mean and scale of the earlier classes alone, as
+    # they were known at the time; scaling fitted on every class would leak
+    # the later classes into the comps. The pool index is built once and
+    # searched with every weight setting. Queries go chunk_size at a time so
+    # the distance matrix stays bounded.
+    pool_rows = np.flatnonzero(pool)
+    pool_index = SimilarityIndex.from_values(index.raw_values(pool_rows), index.features, index.weights,
+                                             index.min_overlap)
+    baseline = float(minutes[pool].mean())
+    comp_minutes = {setting: [] for setting, _ in settings}
+    for start in range(0, len(queries), chunk_size):
+        points = index.raw_values(queries[start:start + chunk_size])
+        for setting, weights in settings:
+            positions, distances = pool_index.query_many(points, k=k, weights=weights)
+            comp_minutes[setting].append(np.where(np.isfinite(distances), minutes[pool_rows[positions]], np.nan))
+
+    results = []
+    for setting, _ in settings:
+        comps = np.concatenate(comp_minutes[setting])
+        with np.errstate(invalid='ignore'):
+            counts = np.isfinite(comps).sum(axis=1)
+            predicted = np.nansum(comps, axis=1) / counts
+        scored = counts > 0
+        results.append((year, setting, queries[scored], predicted[scored], baseline))
+    return results
+
+
+def spearman(a, b):
+    if len(a) < 2:
+        return np.nan
+    ranks_a = pd.Series(a).rank().to_numpy()
+    ranks_b = pd.Series(b).rank().to_numpy()
+    if ranks_a.std() == 0 or ranks_b.std() == 0:
+        return np.nan
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+def score(actual, predicted, baseline):
+    errors = predicted - actual
+    return {
+        'players': len(actual),
+        'mae': float(np.abs(errors).mean()) if len(actual) else np.nan,
+        'rmse': float(np.sqrt((errors ** 2).mean())) if len(actual) else np.nan,
+        'spearman': spearman(actual, predicted),
+        'baseline_mae': float(np.abs(baseline - actual).mean()) if len(actual) else np.nan,
+    }
+
+
+def class_years(final_df):
+    # Combine class of each row, from its "2015-16" season label
+    return pd.to_numeric(final_df['Season'].astype(str).str[:4], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def run_backtest(data, years=None, settings=None, k=6, filters=None, missing_minutes=0.0, workers=None):
+    # For every (draft class, weight setting), find each player's comps among
+    # earlier classes only and predict their minutes as the comps' mean.
+    # Returns (by_year, summary, predictions) frames; the baseline predicts the
+    # pool's mean minutes for everyone.
+    settings = settings or WEIGHT_SETTINGS
+    final_df = data.final_df
+    years_all = class_years(final_df)
+    minutes = final_df[TARGET].to_numpy(dtype=np.float64, na_value=np.nan)
+    if missing_minutes is not None:
+        # Combine participants who never logged NBA minutes count as zero
+        minutes = np.where(np.isnan(minutes), missing_minutes, minutes)
+    pool_mask = combine_masks(data.filter_masks, filters)
+
+    if years is None:
+        years = sorted(int(y) for y in np.unique(years_all[~np.isnan(years_all)]))[1:]
+    # One task per class, covering every setting; weights go to the workers
+    # as plain per-feature arrays
+    vectors = [(name, data.index.weight_vector(weights)) for name, weights in settings.items()]
+    tasks = [(year, vectors, k) for year in years]
+    if not tasks or not vectors:
+        raise ValueError("no draft classes to backtest")
+
+    initargs = (data.index, years_all, minutes, pool_mask)
+    if workers == 1:
+        _init_worker(*initargs)
+        results = [_backtest_class(*task) for task in tasks]
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork') if 'fork' in methods else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=initargs) as executor:
+            results = list(executor.map(_backtest_class, *zip(*tasks)))
+    # Reported setting by setting, each in class order
+    results = sorted((r for year_results in results for r in year_results), key=lambda r: list(settings).index(r[1]))
+
+    by_year, predictions = [], []
+    for year, setting, queries, predicted, baseline in results:
+        actual = minutes[queries]
+        by_year.append(dict(setting=setting, year=year, **score(actual, predicted, baseline)))
+        predictions.append(pd.DataFrame({
+            'setting': setting,
+            'year': year,
+            'PLAYER_NAME': final_df['PLAYER_NAME'].iloc[queries].astype(object).to_numpy(),
+            'actual': actual,
+            'predicted': predicted,
+            'baseline': baseline,
+        }))
+    by_year = pd.DataFrame(by_year)
+    predictions = pd.concat(predictions, ignore_index=True)
+
+    summary = pd.DataFrame([
+        dict(setting=setting, **score(group['actual'].to_numpy(), group['predicted'].to_numpy(),
+                                      group['baseline'].to_numpy()))
+        for setting, group in predictions.groupby('setting', sort=False)
+    ])
+    return by_year, summary, predictions
+
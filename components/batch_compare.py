@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from utils.compact import decode_rows
+
+REPORT_COLUMNS = ['PLAYER_NAME', 'Season', 'POSITION', 'Pick', 'DraftYear', 'Minutes Played Per Game']
+
+
+def compare_prospects(data, prospects_df, k=6, filters=None, chunk_size=256, name_column='Player'):
+    # Top-k comps for every prospect, one row per (prospect, rank). Prospects
+    # are scored chunk_size at a time so the distance matrix stays bounded.
+    index = data.index
+
+    measured = prospects_df.reindex(columns=index.features).notna().any(axis=1)
+    if not measured.all():
+        skipped = prospects_df.loc[~measured, name_column].tolist()
+        print(f"Skipping prospects without any measurements: {skipped}")
+    prospects_df = prospects_df[measured].reset_index(drop=True)
+
+    # Each prospect's percentile in the combine history per measurement,
+    # ranked for the whole list at once
+    percentiles = {
+        f'{feature}_PCT': data.percentiles.percentile(feature, prospects_df[feature].to_numpy(dtype=np.float64, na_value=np.nan))
+        for feature in index.features if feature in prospects_df.columns
+    }
+
+    reports, fallback = [], False
+    for start in range(0, len(prospects_df), chunk_size):
+        chunk = prospects_df.iloc[start:start + chunk_size]
+        positions, distances, chunk_fallback = data.query_many(chunk, k=k, filters=filters)
+        fallback |= chunk_fallback
+        n_chunk, n_comps = positions.shape
+
+        report = data.final_df[[c for c in REPORT_COLUMNS if c in data.final_df.columns]].iloc[positions.ravel()]
+        report = decode_rows(report).reset_index(drop=True)
+        report.insert(0, 'Prospect', np.repeat(chunk[name_column].to_numpy(), n_comps))
+        report.insert(1, 'Rank', np.tile(np.arange(1, n_comps + 1), n_chunk))
+        report['Distance'] = distances.ravel()
+        for column, values in percentiles.items():
+            report[column] = np.repeat(np.round(values[start:start + chunk_size], 1), n_comps)
+        reports.append(report[np.isfinite(report['Distance'].to_numpy())])
+    if fallback:
+        print("Too few players in the selected position groups, comps cover all positions")
+
+    if not reports:
+        return pd.DataFrame(columns=['Prospect', 'Rank'] + REPORT_COLUMNS + ['Distance'] + list(percentiles))
+    return pd.concat(reports, ignore_index=True)
+
+
+def write_report(report, path):
+    if path.endswith('.parquet'):
+        report.to_parquet(path, index=False)
+    else:
+        report.to_csv(path, index=False)
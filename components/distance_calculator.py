@@ -1,25 +1,224 @@
+import warnings
+
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-
-def calculate_player_distances(merged_df, player_of_interest):
-    # Select only the relevant columns for distance calculation
-    features = ['HEIGHT_WO_SHOES', 'WINGSPAN', 'STANDING_REACH', 'HAND_LENGTH', 'HAND_WIDTH']
-    
-    # Normalize the data
-    scaler = StandardScaler()
-    df_scaled = pd.DataFrame(scaler.fit_transform(merged_df[features]), columns=features)
-    player_df = pd.DataFrame([player_of_interest])
-    player_scaled = scaler.transform(player_df[features])
-
-    # Calculate distances
-    distances = np.sqrt(np.sum((df_scaled.values - player_scaled.flatten())**2, axis=1))
-
-    # Add distances back to the original DataFrame
-    results_df = merged_df[['PLAYER_NAME', 'Season']].copy()
-    results_df['Distance'] = distances
 
-    # Sort by distance
-    results_df = results_df.sort_values(by='Distance', ascending=True).reset_index(drop=True)
+# Measurements entered in the dashboard
+FEATURES = ['HEIGHT_WO_SHOES', 'WINGSPAN', 'STANDING_REACH', 'HAND_LENGTH', 'HAND_WIDTH']
+DRILL_FEATURES = ['STANDING_VERTICAL_LEAP', 'MAX_VERTICAL_LEAP', 'LANE_AGILITY_TIME',
+                  'MODIFIED_LANE_AGILITY_TIME', 'THREE_QUARTER_SPRINT', 'BENCH_PRESS']
+ALL_FEATURES = FEATURES + ['WEIGHT'] + DRILL_FEATURES
+
+DEFAULT_WEIGHTS = dict({f: 1.0 for f in FEATURES}, WEIGHT=0.5, **{f: 0.5 for f in DRILL_FEATURES})
+
+# A pair is only scored if the features both players have carry at least this
+# share of the query's total weight
+MIN_OVERLAP = 0.5
+
+
+def _scale(count, m2):
+    # Population standard deviation; a feature nobody (or everybody equally)
+    # has gets scale 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.sqrt(np.maximum(m2, 0.0) / count)
+    scale[~np.isfinite(scale) | (scale == 0)] = 1.0
+    return scale
+
+
+def _batch_stats(values):
+    count = (~np.isnan(values)).sum(axis=0).astype(np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(values.shape[1])
+    return count, mean, np.nansum((values - mean) ** 2, axis=0)
+
+
+def _add_stats(count, mean, m2, values):
+    n_b, mean_b, m2_b = _batch_stats(values)
+    total = count + n_b
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = mean_b - mean
+        new_mean = np.where(total > 0, mean + delta * n_b / total, 0.0)
+        new_m2 = np.where(total > 0, m2 + m2_b + delta ** 2 * count * n_b / total, 0.0)
+    return total, new_mean, new_m2
+
+
+def _remove_stats(count, mean, m2, values):
+    # Inverse of _add_stats
+    n_b, mean_b, m2_b = _batch_stats(values)
+    total = count - n_b
+    with np.errstate(divide='ignore', invalid='ignore'):
+        new_mean = np.where(total > 0, (count * mean - n_b * mean_b) / total, 0.0)
+        delta = mean_b - new_mean
+        new_m2 = np.where(total > 0, m2 - m2_b - delta ** 2 * total * n_b / count, 0.0)
+    return np.maximum(total, 0), new_mean, np.maximum(new_m2, 0.0)
+
+
+class SimilarityIndex:
+    # Standardized feature block for the comparison pool, built once and
+    # reused for every query. Rows line up with the frame it was built from.
+    # Missing measurements stay NaN in `scaled`; distances only use the
+    # features both players have and are rescaled to the query's full weight.
+    # `count` and `m2` are the per-feature running statistics (values seen and
+    # sum of squared deviations) behind mean and scale, kept so a season can be
+    # upserted without refitting on the whole pool. `present`, `filled` and
+    # `filled_sq` are derived from `scaled` unless passed in, e.g. memory-mapped
+    # from an artifact.
+    def __init__(self, scaled, mean, scale, features=ALL_FEATURES, weights=None, min_overlap=MIN_OVERLAP,
+                 count=None, m2=None, present=None, filled=None, filled_sq=None):
+        self.features = list(features)
+        self.scaled = np.ascontiguousarray(scaled, dtype=np.float32)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.min_overlap = min_overlap
+        self.weights = np.array([DEFAULT_WEIGHTS.get(f, 1.0) for f in self.features], dtype=np.float32)
+        self.weights = self.weight_vector(weights)
+
+        if present is None:
+            present = (~np.isnan(self.scaled)).astype(np.float32)
+        if count is None or m2 is None:
+            # Recovered from the block itself, e.g. for artifacts written without them
+            count = present.sum(axis=0)
+            m2 = np.nansum(self.scaled.astype(np.float64) ** 2, axis=0) * self.scale ** 2
+        self.count = np.asarray(count, dtype=np.float64)
+        self.m2 = np.asarray(m2, dtype=np.float64)
+
+        self.present = present
+        self.filled = filled if filled is not None else np.where(present > 0, self.scaled, np.float32(0))
+        self.filled_sq = filled_sq if filled_sq is not None else self.filled * self.filled
+
+    @classmethod
+    def from_frame(cls, df, features=ALL_FEATURES, weights=None, min_overlap=MIN_OVERLAP):
+        features = [f for f in features if f in df.columns]
+        values = df[features].to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls.from_values(values, features, weights, min_overlap)
+
+    @classmethod
+    def from_values(cls, values, features=ALL_FEATURES, weights=None, min_overlap=MIN_OVERLAP):
+        # Same parameters StandardScaler would fit, ignoring missing values
+        count, mean, m2 = _batch_stats(values)
+        scale = _scale(count, m2)
+        return cls((values - mean) / scale, mean, scale, features, weights, min_overlap, count, m2)
+
+    def raw_values(self, rows=slice(None)):
+        # Measurements of the given rows in their original units
+        return self.scaled[rows].astype(np.float64) * self.scale + self.mean
+
+    def upsert(self, keep, values):
+        # New index holding the rows selected by the boolean `keep` followed by
+        # the raw feature rows in `values`. Statistics are updated from the
+        # removed and added rows only (Chan's parallel update), and the kept
+        # rows are moved onto the new mean and scale with one affine step, so
+        # nothing is refit. The live arrays are never modified.
+        keep = np.asarray(keep, dtype=bool)
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.features))
+        removed = self.scaled[~keep].astype(np.float64) * self.scale + self.mean
+
+        count, mean, m2 = _remove_stats(self.count, self.mean, self.m2, removed)
+        count, mean, m2 = _add_stats(count, mean, m2, values)
+        scale = _scale(count, m2)
+
+        ratio = (self.scale / scale).astype(np.float32)
+        shift = ((self.mean - mean) / scale).astype(np.float32)
+        scaled = np.concatenate([
+            self.scaled[keep] * ratio + shift,
+            ((values - mean) / scale).astype(np.float32),
+        ])
+        present = np.concatenate([self.present[keep], (~np.isnan(values)).astype(np.float32)])
+        return SimilarityIndex(scaled, mean, scale, self.features, self.weights, self.min_overlap, count, m2, present)
+
+    def subset(self, rows):
+        # Index over some of the rows that keeps this index's scaling and
+        # statistics, so its distances match the full index. A slice of rows
+        # gives views, which keeps a memory-mapped index shared.
+        return SimilarityIndex(self.scaled[rows], self.mean, self.scale, self.features, self.weights,
+                               self.min_overlap, self.count, self.m2,
+                               self.present[rows], self.filled[rows], self.filled_sq[rows])
+
+    def __len__(self):
+        return self.scaled.shape[0]
+
+    def weight_vector(self, weights=None):
+        if weights is None:
+            return self.weights
+        if isinstance(weights, dict):
+            return np.array([weights.get(f, DEFAULT_WEIGHTS.get(f, 1.0)) for f in self.features], dtype=np.float32)
+        return np.asarray(weights, dtype=np.float32)
+
+    def transform(self, points):
+        if isinstance(points, dict):
+            points = [points]
+        if isinstance(points, pd.DataFrame):
+            values = points.reindex(columns=self.features).to_numpy(dtype=np.float64, na_value=np.nan)
+        elif len(points) and isinstance(points[0], dict):
+            values = np.array([[p.get(f) for f in self.features] for p in points], dtype=np.float64)
+        else:
+            values = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        return (values - self.mean) / self.scale
+
+    def squared_distances(self, points, weights=None):
+        # Weighted squared distance over the features both sides have, for all
+        # points at once. With P the presence mask and W the per-query weights:
+        #   sum_f W (z - q)^2 P = Z^2 @ W - 2 Z @ (W q) + P @ (W q^2)
+        queries = self.transform(points)
+        q_present = ~np.isnan(queries)
+        q_filled = np.where(q_present, queries, 0.0)
+
+        w = self.weight_vector(weights)[None, :] * q_present
+        wq = w * q_filled
+        w, wq, wq2 = w.astype(np.float32), wq.astype(np.float32), (wq * q_filled).astype(np.float32)
+
+        num = w @ self.filled_sq.T - 2.0 * (wq @ self.filled.T) + wq2 @ self.present.T
+        compared = w @ self.present.T
+        total = w.sum(axis=1)[:, None]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d2 = np.maximum(num, 0.0) * (total / compared)
+        d2[~(compared >= self.min_overlap * total) | ~(compared > 0)] = np.inf
+        return d2
+
+    def query_many(self, points, k=6, mask=None, weights=None):
+        # Top-k rows for each point, nearest first. Returns (positions, distances),
+        # each shaped (n_points, k); rows outside `mask` are never returned and
+        # rows that share too few features with a point come back as inf.
+        d2 = self.squared_distances(points, weights)
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+            d2 = d2[:, candidates]
+        else:
+            candidates = None
+
+        k = min(k, d2.shape[1])
+        if k == 0:
+            empty = np.empty((d2.shape[0], 0))
+            return empty.astype(np.intp), empty
+
+        if k < d2.shape[1]:
+            top = np.argpartition(d2, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(d2.shape[1]), (d2.shape[0], 1))
+        top_d2 = np.take_along_axis(d2, top, axis=1)
+        order = np.argsort(top_d2, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_d2 = np.take_along_axis(top_d2, order, axis=1)
+
+        positions = candidates[top] if candidates is not None else top
+        return positions, np.sqrt(top_d2.astype(np.float64))
+
+    def query(self, point, k=6, mask=None, weights=None):
+        positions, distances = self.query_many([point], k=k, mask=mask, weights=weights)
+        scored = np.isfinite(distances[0])
+        return positions[0][scored], distances[0][scored]
+
+
+def calculate_player_distances(merged_df, player_of_interest, top_k=None, index=None):
+    if index is None:
+        index = SimilarityIndex.from_frame(merged_df)
+
+    k = len(index) if top_k is None else top_k
+    positions, distances = index.query(player_of_interest, k=k)
+
+    results_df = merged_df[['PLAYER_NAME', 'Season']].iloc[positions].copy()
+    results_df['Distance'] = distances
 
-    return results_df
+    return results_df.reset_index(drop=True)
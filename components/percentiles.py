@@ -0,0 +1,86 @@
+import numpy as np
+
+from components.distance_calculator import ALL_FEATURES
+from components.player_filters import position_groups
+
+# Timed drills, where a lower value is better. Their percentiles are inverted
+# so that a higher percentile always means a better result.
+LOWER_IS_BETTER = {'LANE_AGILITY_TIME', 'MODIFIED_LANE_AGILITY_TIME', 'THREE_QUARTER_SPRINT'}
+
+
+def _sorted_values(values):
+    # Rounded to what was measured, so float32 storage and float64 queries agree on ties
+    values = np.round(values[~np.isnan(values)], 2)
+    values.sort()
+    return values
+
+
+class PercentileTables:
+    # Sorted history of every metric, overall (group None) and per position
+    # group, built once at load time. A value is ranked with two binary
+    # searches instead of sorting the column per request.
+    def __init__(self, tables):
+        self.tables = tables
+
+    @classmethod
+    def from_frame(cls, df, features=ALL_FEATURES, groups=None):
+        features = [f for f in features if f in df.columns]
+        if groups is None:
+            groups = position_groups(df)
+        tables = {None: {}}
+        tables.update({group: {} for group in sorted({g for g in groups if isinstance(g, str)})})
+        for feature in features:
+            values = df[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+            for group, table in tables.items():
+                table[feature] = _sorted_values(values if group is None else values[groups == group])
+        return cls(tables)
+
+    def upsert(self, removed, removed_groups, added, added_groups):
+        # New tables without the rows of `removed` and with those of `added`
+        # (frames with the metric columns, plus their position groups). Each
+        # sorted history is edited in place of being sorted again: removed
+        # values are located with searchsorted and deleted, added ones inserted.
+        groups = set(self.tables) | {g for g in added_groups if isinstance(g, str)}
+        features = list(self.tables[None])
+        tables = {}
+        for group in [None] + sorted(g for g in groups if g is not None):
+            table = self.tables.get(group, {})
+            tables[group] = {}
+            for feature in features:
+                history = table.get(feature, np.empty(0))
+                drop = removed[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+                add = added[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+                if group is not None:
+                    drop, add = drop[removed_groups == group], add[added_groups == group]
+                drop, add = _sorted_values(drop), _sorted_values(add)
+                # Repeated values delete consecutive copies
+                at = np.searchsorted(history, drop) + np.arange(len(drop)) - np.searchsorted(drop, drop)
+                history = np.delete(history, at)
+                tables[group][feature] = np.insert(history, np.searchsorted(history, add), add)
+        return PercentileTables(tables)
+
+    def percentile(self, feature, values, group=None):
+        # Share of players below each value (ties count half), 0-100, or above
+        # it for LOWER_IS_BETTER metrics; NaN for missing values or metrics
+        # nobody has
+        history = self.tables.get(group, {}).get(feature)
+        values = np.round(np.asarray(values, dtype=np.float64), 2)
+        if history is None or not len(history):
+            return np.full(values.shape, np.nan)
+        below = np.searchsorted(history, values, side='left')
+        at_or_below = np.searchsorted(history, values, side='right')
+        percentiles = 50.0 * (below + at_or_below) / len(history)
+        if feature in LOWER_IS_BETTER:
+            percentiles = 100.0 - percentiles
+        return np.where(np.isnan(values), np.nan, percentiles)
+
+    def rank(self, point, group=None):
+        # {feature: percentile} for the measurements present in `point`
+        ranks = {}
+        for feature, value in point.items():
+            if value is None or feature not in self.tables.get(group, {}):
+                continue
+            pct = float(self.percentile(feature, value, group))
+            if pct == pct:
+                ranks[feature] = round(pct, 1)
+        return ranks
@@ -0,0 +1,98 @@
+import numpy as np
+
+# Filter checklist options. Each predicate takes the comparison frame and
+# returns a boolean array; masks are computed once when the data is loaded and
+# ANDed together per request. Filters registered with the same `group` are
+# alternatives and ORed together first (Guards or Wings).
+FILTERS = {}
+
+
+def register_filter(value, label, group=None):
+    def decorator(predicate):
+        FILTERS[value] = {"label": label, "predicate": predicate, "group": group}
+        return predicate
+    return decorator
+
+
+@register_filter("first_round", "First Round Draft Picks")
+def first_round(df):
+    return df['Pick'].between(1, 30)
+
+
+@register_filter("significant_minutes", "Played Significant Minutes")
+def significant_minutes(df):
+    return df['Minutes Played Per Game'] >= 10  # Example threshold
+
+
+@register_filter("was_drafted", "Was Drafted")
+def was_drafted(df):
+    # Undrafted players have a NaN or MISSING (-1) pick
+    return df['Pick'] >= 1
+
+
+# Combine position strings ("PG", "SG-SF", "PF-C") by group. A listing that
+# spans two groups counts as a wing.
+POSITION_GROUPS = {
+    'PG': 'guard', 'SG': 'guard', 'G': 'guard',
+    'SF': 'wing', 'F': 'wing', 'GF': 'wing',
+    'PF': 'big', 'C': 'big', 'FC': 'big',
+}
+POSITION_FILTERS = {'guards': 'guard', 'wings': 'wing', 'bigs': 'big'}
+
+
+def position_group(position):
+    if not isinstance(position, str):
+        return None
+    groups = {POSITION_GROUPS.get(part.strip().upper()) for part in position.split('-')}
+    groups.discard(None)
+    if not groups:
+        return None
+    return groups.pop() if len(groups) == 1 else 'wing'
+
+
+def position_groups(df):
+    # Mapped once per distinct position string
+    positions = df['POSITION'].astype(object)
+    return positions.map({p: position_group(p) for p in positions.dropna().unique()}).to_numpy(dtype=object)
+
+
+@register_filter("guards", "Guards", group="position")
+def guards(df):
+    return position_groups(df) == 'guard'
+
+
+@register_filter("wings", "Wings", group="position")
+def wings(df):
+    return position_groups(df) == 'wing'
+
+
+@register_filter("bigs", "Bigs", group="position")
+def bigs(df):
+    return position_groups(df) == 'big'
+
+
+def filter_options():
+    return [{"label": f["label"], "value": value} for value, f in FILTERS.items()]
+
+
+def build_filter_masks(df, groups=None):
+    # Position masks come from `groups` (position_groups(df)) when the caller
+    # already has them, instead of mapping the positions once per filter
+    if groups is None:
+        groups = position_groups(df)
+    return {
+        value: np.ascontiguousarray(groups == POSITION_FILTERS[value] if value in POSITION_FILTERS else f["predicate"](df),
+                                    dtype=bool)
+        for value, f in FILTERS.items()
+    }
+
+
+def combine_masks(masks, selected):
+    # None means no filter selected, i.e. every row is a candidate
+    groups = {}
+    for value in selected or []:
+        if value in masks:
+            groups.setdefault(FILTERS[value]["group"] or value, []).append(masks[value])
+    if not groups:
+        return None
+    return np.logical_and.reduce([np.logical_or.reduce(group) for group in groups.values()])
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+
+from components.player_filters import FILTERS, POSITION_FILTERS, position_groups
+
+# A position search falls back to all positions when the selected partitions
+# hold fewer candidates than this (after the other filters), or fewer than k
+MIN_PARTITION_SIZE = int(os.environ.get("NBA_COMBINE_MIN_PARTITION_SIZE", 25))
+
+
+class PositionPartitions:
+    # One feature block per position group (guard/wing/big), cut from the full
+    # index so all partitions share its scaling. Position filters are answered
+    # by scanning only the selected partitions instead of masking the full block.
+    def __init__(self, index, groups, min_size=MIN_PARTITION_SIZE):
+        self.min_size = min_size
+        self.partitions = {}
+        for group in sorted(set(POSITION_FILTERS.values())):
+            rows = np.flatnonzero(groups == group)
+            # Artifacts store each group's rows together (see write_artifact),
+            # so the partition is a view of the shared block, not a copy
+            contiguous = len(rows) and rows[-1] - rows[0] + 1 == len(rows)
+            block = slice(rows[0], rows[-1] + 1) if contiguous else rows
+            self.partitions[group] = (rows, index.subset(block))
+
+    @classmethod
+    def from_frame(cls, df, index, min_size=MIN_PARTITION_SIZE, groups=None):
+        return cls(index, position_groups(df) if groups is None else groups, min_size)
+
+    def query_many(self, points, groups, k=6, mask=None, weights=None):
+        # Top-k over the given groups, as positions into the full frame. Returns
+        # None when the groups are too small, so the caller can search everyone.
+        selected = []
+        for group in groups:
+            rows, index = self.partitions[group]
+            sub_mask = mask[rows] if mask is not None else None
+            candidates = len(rows) if sub_mask is None else int(sub_mask.sum())
+            selected.append((rows, index, sub_mask, candidates))
+        if sum(s[3] for s in selected) < max(k, self.min_size):
+            return None
+
+        results = [index.query_many(points, k=k, mask=sub_mask, weights=weights)
+                   for rows, index, sub_mask, candidates in selected if candidates]
+        rows = [s[0] for s in selected if s[3]]
+        if len(results) == 1:
+            positions, distances = results[0]
+            return rows[0][positions], distances
+
+        # Merge the per-partition top-k lists
+        positions = np.concatenate([r[p] for r, (p, _) in zip(rows, results)], axis=1)
+        distances = np.concatenate([d for _, d in results], axis=1)
+        order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        return np.take_along_axis(positions, order, axis=1), np.take_along_axis(distances, order, axis=1)
+
+
+def split_filters(selected):
+    # (position groups, other filter values) for a checklist selection
+    groups = sorted({POSITION_FILTERS[v] for v in selected or [] if v in POSITION_FILTERS})
+    others = [v for v in selected or [] if v in FILTERS and v not in POSITION_FILTERS]
+    return groups, others
+
+
+def selected_group(selected):
+    # The position group to rank against when exactly one is checked
+    groups, _ = split_filters(selected)
+    return groups[0] if len(groups) == 1 else None
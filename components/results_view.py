@@ -0,0 +1,146 @@
+import math
+
+import pandas as pd
+from dash import html, dcc, dash_table
+
+PROSPECT_COLOR = '#BE0000'
+COMP_COLOR = 'steelblue'
+
+
+def _cell(value):
+    return str(value) if pd.notna(value) else "—"
+
+
+def comparison_table(display_df, you_row):
+    # One DataTable carrying the prospect row followed by the ranked comps
+    columns = ["#"] + list(display_df.columns)
+    records = [dict({"#": "—"}, **{col: _cell(you_row[col]) for col in display_df.columns})]
+    for i, row in enumerate(display_df.itertuples(index=False), 1):
+        records.append(dict({"#": f"{i}."}, **{col: _cell(value) for col, value in zip(display_df.columns, row)}))
+
+    return dash_table.DataTable(
+        columns=[{"name": col, "id": col} for col in columns],
+        data=records,
+        style_table={
+            "overflowX": "auto",
+            "maxWidth": "100%",
+            "border": "1px solid #ccc",
+            "padding": "10px",
+            "borderRadius": "10px",
+            "backgroundColor": "#f9f9f9"
+        },
+        style_header={"backgroundColor": "#2c3e50", "color": "white", "border": "1px solid #ddd"},
+        style_cell={"textAlign": "left", "padding": "8px", "border": "1px solid #ddd", "whiteSpace": "nowrap"},
+        style_data_conditional=[
+            {"if": {"row_index": "odd"}, "backgroundColor": "#f9f9f9"},
+            {"if": {"row_index": 0}, "fontWeight": "bold", "borderBottom": "3px solid #2c3e50"},
+        ],
+    )
+
+
+def _ordinal(pct):
+    n = int(round(pct))
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def _badges(col, percentiles, group_percentiles, group_label):
+    # One badge per box keeps the component count (and callback time) down
+    parts = []
+    if col in percentiles:
+        parts.append(f"{_ordinal(percentiles[col])} pct")
+    if col in group_percentiles:
+        parts.append(f"{_ordinal(group_percentiles[col])} among {group_label}")
+    return [html.Div(" · ".join(parts), className="metric-badge")] if parts else []
+
+
+def averages_section(avg_values, percentiles=None, prospect_values=None, prospect_percentiles=None,
+                     group_percentiles=None, group_label=None):
+    # Comp averages, each with its percentile in the combine history, and a
+    # row ranking the prospect's own measurements. Percentile dicts are keyed
+    # by the display labels.
+    percentiles = percentiles or {}
+    prospect_percentiles = prospect_percentiles or {}
+    group_percentiles = group_percentiles or {}
+
+    children = [
+        html.H3("Similar Player Average Metrics", style={"textAlign": "center", "marginTop": "30px"}),
+        html.Div([
+            html.Div([
+                html.Div(col, className="metric-label"),
+                html.Div(f"{val}", className="metric-value"),
+            ] + _badges(col, percentiles, {}, None), className="metric-box") for col, val in avg_values.items()
+        ], className="averages-container")
+    ]
+
+    if prospect_percentiles:
+        children += [
+            html.H3("Prospect Percentiles in Combine History", style={"textAlign": "center", "marginTop": "30px"}),
+            html.Div([
+                html.Div([
+                    html.Div(col, className="metric-label"),
+                    html.Div(f"{prospect_values[col]}", className="metric-value"),
+                ] + _badges(col, prospect_percentiles, group_percentiles, group_label), className="metric-box")
+                for col in prospect_percentiles
+            ], className="averages-container")
+        ]
+
+    return html.Div(children)
+
+
+def _y_range(values):
+    sorted_vals = sorted(values.dropna())
+    y_min = sorted_vals[1] * 0.85 if len(sorted_vals) >= 2 and sorted_vals[0] == 0 else (sorted_vals[0] * 0.95 if sorted_vals else 0)
+    y_max = max(sorted_vals) * 1.15 if sorted_vals else 1
+    return y_min, y_max
+
+
+def _domains(n, gap):
+    size = (1.0 - gap * (n - 1)) / n
+    return [[i * (size + gap), i * (size + gap) + size] for i in range(n)]
+
+
+def metric_comparison_figure(selected_row, display_df, metrics, n_cols=2):
+    # Every metric as one panel of a single figure instead of a Graph per
+    # metric. The figure is built as a plain dict so it skips plotly's
+    # per-property validation, which dominated the callback time.
+    metrics = list(metrics)
+    n_rows = max(1, math.ceil(len(metrics) / n_cols))
+    x_domains = _domains(n_cols, 0.08)
+    y_domains = _domains(n_rows, 0.3 / n_rows)[::-1]
+
+    traces, annotations = [], []
+    layout = {"height": 300 * n_rows, "margin": {"t": 60, "b": 40}, "showlegend": False}
+
+    for i, col in enumerate(metrics):
+        full_y = pd.concat([selected_row[['Player Name', col]], display_df[['Player Name', col]]])
+        y_min, y_max = _y_range(full_y[col])
+
+        # First bar red, rest steelblue
+        colors = [PROSPECT_COLOR] + [COMP_COLOR] * (len(full_y) - 1)
+
+        suffix = "" if i == 0 else str(i + 1)
+        x_domain = x_domains[i % n_cols]
+        y_domain = y_domains[i // n_cols]
+        values = full_y[col].tolist()
+        traces.append({
+            "type": "bar",
+            "x": full_y['Player Name'].tolist(),
+            "y": [v if v != "N/A" else 0 for v in values],
+            "text": [None if pd.isna(v) else v for v in values],
+            "textposition": "outside",
+            "marker": {"color": colors},
+            "name": col,
+            "xaxis": f"x{suffix}",
+            "yaxis": f"y{suffix}",
+        })
+        layout[f"xaxis{suffix}"] = {"domain": x_domain, "anchor": f"y{suffix}"}
+        layout[f"yaxis{suffix}"] = {"domain": y_domain, "anchor": f"x{suffix}", "range": [y_min, y_max]}
+        annotations.append({
+            "text": col, "showarrow": False, "xref": "paper", "yref": "paper",
+            "x": sum(x_domain) / 2, "y": y_domain[1], "xanchor": "center", "yanchor": "bottom",
+            "font": {"size": 14},
+        })
+
+    layout["annotations"] = annotations
+    return dcc.Graph(figure={"data": traces, "layout": layout})
@@ -0,0 +1,199 @@
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from flask import Response, request
+from components.player_filters import FILTERS
+from components.position_partitions import selected_group
+from utils import metrics
+from utils.compact import decode_rows
+
+API_CACHE_SIZE = int(os.environ.get("SIMILARITY_API_CACHE_SIZE", 4096))
+MAX_K = 50
+
+# Query parameter -> feature column
+MEASUREMENT_PARAMS = {
+    'height': 'HEIGHT_WO_SHOES',
+    'wingspan': 'WINGSPAN',
+    'reach': 'STANDING_REACH',
+    'hand_length': 'HAND_LENGTH',
+    'hand_width': 'HAND_WIDTH',
+}
+
+# Accepted range per measurement, in inches, well outside anything measured at
+# the combine; values beyond it are typos (or centimeters) and would only
+# produce meaningless comps
+MEASUREMENT_RANGES = {
+    'height': (48, 108),
+    'wingspan': (48, 120),
+    'reach': (60, 144),
+    'hand_length': (4, 16),
+    'hand_width': (4, 16),
+}
+
+COMP_FIELDS = {
+    'player': 'PLAYER_NAME',
+    'season': 'Season',
+    'position': 'POSITION',
+    'pick': 'Pick',
+    'draft_year': 'DraftYear',
+    'minutes_per_game': 'Minutes Played Per Game',
+}
+
+
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.items:
+                self.items.move_to_end(key)
+                self.hits += 1
+                return self.items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.items), 'maxsize': self.maxsize}
+
+
+def _json_value(value):
+    if isinstance(value, (np.integer, np.floating)):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def normalize_query(args):
+    # Round measurements and sort filters so equivalent requests share a cache entry
+    if not isinstance(args, dict):
+        raise ValueError("request body must be a JSON object")
+    measurements = []
+    for param, feature in MEASUREMENT_PARAMS.items():
+        raw = args.get(param, args.get(feature))
+        if raw is None or raw == '':
+            raise ValueError(f"missing measurement '{param}'")
+        if isinstance(raw, bool):
+            raise ValueError(f"measurement '{param}' must be a number")
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"measurement '{param}' must be a number")
+        if not math.isfinite(value):
+            raise ValueError(f"measurement '{param}' must be a finite number")
+        low, high = MEASUREMENT_RANGES[param]
+        if not low <= value <= high:
+            raise ValueError(f"measurement '{param}' must be between {low} and {high} inches")
+        measurements.append((feature, round(value, 2)))
+
+    filters = args.get('filters') or []
+    if isinstance(filters, str):
+        filters = filters.split(',')
+    if not isinstance(filters, list) or not all(isinstance(f, str) for f in filters):
+        raise ValueError("filters must be a list of filter names or a comma-separated string")
+    unknown = [f for f in filters if f not in FILTERS]
+    if unknown:
+        raise ValueError(f"unknown filters {unknown}, expected any of {list(FILTERS)}")
+
+    try:
+        k = args.get('k', 6)
+        if isinstance(k, bool):
+            raise TypeError()
+        k = int(k)
+    except (TypeError, ValueError):
+        raise ValueError("k must be an integer")
+
+    return tuple(measurements), tuple(sorted(set(filters))), max(1, min(k, MAX_K))
+
+
+def find_comps(data, measurements, filters, k):
+    # Returns (comps, fallback); fallback is True when the position filters
+    # had too few players and the comps cover every position
+    positions, distances, fallback = data.query(dict(measurements), k=k, filters=filters)
+
+    records = decode_rows(data.final_df.iloc[positions]).to_dict('records')
+    comps = []
+    for rank, (record, distance) in enumerate(zip(records, distances), 1):
+        comp = {'rank': rank}
+        comp.update({field: _json_value(record.get(column)) for field, column in COMP_FIELDS.items()})
+        comp['distance'] = round(float(distance), 4)
+        comps.append(comp)
+    return comps, fallback
+
+
+def query_percentiles(data, measurements, filters):
+    # Where the query's measurements rank in the combine history, keyed by
+    # query parameter; also within the position group when exactly one is checked
+    params = {feature: param for param, feature in MEASUREMENT_PARAMS.items()}
+    point = dict(measurements)
+    percentiles = {'overall': {params[f]: pct for f, pct in data.percentiles.rank(point).items()}}
+    group = selected_group(filters)
+    if group:
+        percentiles[group] = {params[f]: pct for f, pct in data.percentiles.rank(point, group).items()}
+    return percentiles
+
+
+def register_similarity_api(server, get_data, cache_size=API_CACHE_SIZE):
+    # JSON similarity endpoint on the Flask server behind the Dash app.
+    # Serialized responses are cached per dataset version and normalized query.
+    cache = LRUCache(cache_size)
+    metrics.register_collector(lambda: {
+        'api_cache_hits_total': cache.hits,
+        'api_cache_misses_total': cache.misses,
+    })
+
+    @server.route('/api/similar', methods=['GET', 'POST'])
+    def similar_players():
+        args = request.get_json(silent=True) if request.method == 'POST' else None
+        args = args or request.args.to_dict()
+        if 'filters' not in args and request.args.getlist('filters'):
+            args['filters'] = request.args.getlist('filters')
+
+        try:
+            measurements, filters, k = normalize_query(args)
+        except ValueError as e:
+            return Response(json.dumps({'error': str(e)}), status=400, mimetype='application/json')
+
+        data = get_data()
+        if data is None:
+            return Response(json.dumps({'error': 'comparison data is still loading'}), status=503,
+                            mimetype='application/json', headers={'Retry-After': '5'})
+        key = (data.version, measurements, filters, k)
+        body = cache.get(key)
+        if body is None:
+            with metrics.span("api_similar"):
+                comps, fallback = find_comps(data, measurements, filters, k)
+                body = json.dumps({
+                    'version': data.version,
+                    'query': dict(measurements),
+                    'filters': list(filters),
+                    'position_fallback': fallback,
+                    'percentiles': query_percentiles(data, measurements, filters),
+                    'comps': comps,
+                })
+            cache.put(key, body)
+
+        return Response(body, mimetype='application/json')
+
+    @server.route('/api/similar/cache', methods=['GET'])
+    def similar_players_cache():
+        return Response(json.dumps(cache.stats()), mimetype='application/json')
+
+    return cache
@@ -1,60 +1,87 @@
+import os
+
 import pandas as pd
 from dash import Dash, html, dcc, Input, Output, State
-from utils.data_downloader import download_draft_combine_anthro_data, download_draft_combine_drill_data
-from utils.data_cleaner import clean_and_merge
-from utils.player_loader import load_custom_players
-from components.distance_calculator import calculate_player_distances
-import plotly.express as px
-import plotly.graph_objects as go
-
-
-# Load and clean data
-anthro_data_all, drill_data_all = [], []
-for year in range(2000, 2025):
-    season = f"{year}-{str(year+1)[2:]}"
-    anthro = download_draft_combine_anthro_data(season=season)
-    drill = download_draft_combine_drill_data(season=season)
-    anthro['Season'], drill['Season'] = season, season
-    anthro_data_all.append(anthro)
-    drill_data_all.append(drill)
-
-merged_df = clean_and_merge(anthro_data_all, drill_data_all)
+from utils.dataset import DataStore
+from utils.health import register_health_routes
+from utils.season_update import SeasonRefresher
+from utils import metrics
+from utils.compact import decode_rows
+from utils.player_loader import load_custom_players, build_prospect_index, prospect_store_data
+from components.distance_calculator import ALL_FEATURES
+from components.player_filters import FILTERS, POSITION_FILTERS, filter_options
+from components.position_partitions import selected_group
+from components.similarity_api import register_similarity_api
+from components.results_view import averages_section, comparison_table, metric_comparison_figure
+
+
+# Load the prebuilt dataset (see process_data.py) in the background so the
+# server can bind and answer health checks while it loads
+data_store = DataStore()
+
+# Re-download the current season every NBA_COMBINE_REFRESH_INTERVAL seconds
+# while the combine is running (off by default); one process writes the
+# updated artifact, every process swaps it in
+season_refresher = SeasonRefresher(data_store)
+
+# Under gunicorn the server hooks start both (the refresher only in the
+# workers, see gunicorn.conf.py); everywhere else they start on import
+if not os.environ.get("NBA_COMBINE_GUNICORN"):
+    data_store.start()
+    season_refresher.start()
 
 utah_players = load_custom_players()
 
-playerStats = load_custom_players("draft_players.csv")
-
-playerMinutes = load_custom_players("minutes_per_player.csv")
-
-# Create lowercase temporary columns for comparison
-merged_df['name_lower'] = merged_df['PLAYER_NAME'].str.lower()
-playerStats['name_lower'] = playerStats['Player'].str.lower()
-playerMinutes['name_lower'] = playerMinutes['Player'].str.lower()
-
-
-# Perform merge on lowercase name match
-final_df = merged_df.merge(
-    playerStats,
-    how='left',
-    on='name_lower',
-    suffixes=('', '_from_stats')
-)
-final_df = final_df.merge(
-    playerMinutes[['name_lower', 'MP']],  # keep only necessary columns
-    how='left',
-    on='name_lower'
-)
-
-# Drop the temporary lowercase column
-final_df = final_df.drop(columns=['name_lower', 'Player', 'Minutes Played'], errors='ignore')
-
-final_df = final_df.rename(columns={'MP': 'Minutes Played Per Game'})
-
-print("Merged DataFrame Columns:", final_df.columns.tolist())
+# Prospect lookups by name, built once instead of scanning utah_players per request
+PROSPECT_DISPLAY_COLUMNS = {
+    'Player': 'Player Name',
+    'HEIGHT_WO_SHOES': 'Height Wo Shoes',
+    'WEIGHT': 'Weight',
+    'WINGSPAN': 'Wingspan',
+    'STANDING_REACH': 'Standing Reach',
+    'HAND_LENGTH': 'Hand Length',
+    'HAND_WIDTH': 'Hand Width',
+    'STANDING_VERTICAL_LEAP': 'Standing Vertical Leap',
+    'MAX_VERTICAL_LEAP': 'Max Vertical Leap',
+    'LANE_AGILITY_TIME': 'Lane Agility Time',
+    'MODIFIED_LANE_AGILITY_TIME': 'Modified Lane Agility Time',
+    'THREE_QUARTER_SPRINT': 'Three Quarter Sprint',
+    'BENCH_PRESS': 'Bench Press'
+}
+prospect_index = build_prospect_index(utah_players)
+
+# Every measurement a prospect has (weight and drills too), so a selected
+# prospect is compared on the full row and not just the five inputs
+prospect_points = {
+    name: {f: float(row[f]) for f in ALL_FEATURES if f in row.index and pd.notna(row[f])}
+    for name, row in prospect_index.items()
+}
+
+# Percentile badges are keyed by display label, e.g. 'Standing Reach'
+POSITION_LABELS = {group: FILTERS[value]["label"] for value, group in POSITION_FILTERS.items()}
+
+
+def by_label(values):
+    return {feature.replace('_', ' ').title(): value for feature, value in values.items()}
+
+
+prospect_chart_rows = {
+    name: row.to_frame().T.rename(columns=PROSPECT_DISPLAY_COLUMNS)
+    for name, row in prospect_index.items()
+}
+no_prospect_chart_row = utah_players.iloc[:0].rename(columns=PROSPECT_DISPLAY_COLUMNS)
 
 app = Dash(__name__)
 
+# JSON similarity endpoint for internal tools
+register_similarity_api(app.server, data_store.get)
+metrics.register_metrics_route(app.server)
+register_health_routes(app.server, data_store)
+
 app.layout = html.Div([
+    dcc.Store(id="prospect-store", data=prospect_store_data(utah_players)),
+    dcc.Interval(id="data-status-interval", interval=1000),
+
     html.H1("NBA Player Comparison Dashboard", style={"textAlign": "center", "marginTop": "20px"}),
 
     # Player Selection + Input Fields + Button
@@ -122,19 +149,17 @@ app.layout = html.Div([
             html.Label("Filter Players By:", style={"fontWeight": "bold", "marginBottom": "10px"}),
             dcc.Checklist(
                 id="filter-checklist",
-                options=[
-                    {"label": "First Round Draft Picks", "value": "first_round"},
-                    {"label": "Played Significant Minutes", "value": "significant_minutes"},
-                    {"label": "Was Drafted", "value": "was_drafted"},
-                ],
+                options=filter_options(),
                 value=[],
                 labelStyle={"display": "block", "marginBottom": "5px"},
                 style={"marginBottom": "20px"}
             )
         ]),
 
+        html.Div(id="data-status", style={"textAlign": "center", "marginBottom": "10px"}),
+
         html.Div([
-            html.Button("Find Closest Players", id="submit-button", n_clicks=0,
+            html.Button("Find Closest Players", id="submit-button", n_clicks=0, disabled=True,
                         style={
                             "height": "45px",
                             "padding": "0 20px",
@@ -158,28 +183,40 @@ app.layout = html.Div([
 ])
 
 
-@app.callback(
+# Prefill the measurement inputs in the browser from the embedded prospect store
+app.clientside_callback(
+    """
+    function(playerName, prospects) {
+        if (playerName && prospects && prospects[playerName]) {
+            return prospects[playerName];
+        }
+        return [null, null, null, null, null];
+    }
+    """,
     [Output("height-input", "value"),
      Output("wingspan-input", "value"),
      Output("reach-input", "value"),
      Output("hand-length-input", "value"),
      Output("hand-width-input", "value")],
-    [Input("utah-player-dropdown", "value")]
+    [Input("utah-player-dropdown", "value")],
+    [State("prospect-store", "data")]
 )
-def populate_inputs(player_name):
-    if player_name:
-        row = utah_players[utah_players["Player"] == player_name]
-
-        if not row.empty:
-            row = row.iloc[0]
-            return (
-                row["HEIGHT_WO_SHOES"],
-                row["WINGSPAN"],
-                row["STANDING_REACH"],
-                row["HAND_LENGTH"],
-                row["HAND_WIDTH"]
-            )
-    return [None] * 5
+
+# Keep the button disabled and show a loading note until the data is ready
+@app.callback(
+    [Output("data-status", "children"),
+     Output("submit-button", "disabled"),
+     Output("data-status-interval", "disabled")],
+    [Input("data-status-interval", "n_intervals")]
+)
+def show_data_status(n_intervals):
+    status = data_store.status()
+    if status["ready"]:
+        return "", False, True
+    if status["error"]:
+        return "Comparison data failed to load, please try again later.", True, True
+    return "Loading comparison data...", True, False
+
 
 @app.callback(
     [Output("closest-players-output-content", "children"),
@@ -196,36 +233,35 @@ def populate_inputs(player_name):
 )
 
 def calculate_and_display(n_clicks, player_name, height, wingspan, reach, hand_length, hand_width, filters):
+    with metrics.span("calculate_and_display"):
+        return _calculate_and_display(n_clicks, player_name, height, wingspan, reach, hand_length, hand_width, filters)
+
+
+def _calculate_and_display(n_clicks, player_name, height, wingspan, reach, hand_length, hand_width, filters):
+    data = data_store.get()
+    if data is None:
+        message = "Comparison data is still loading, please try again in a moment." if n_clicks else ""
+        return message, "", ""
+
     if n_clicks > 0 and all([height, wingspan, reach, hand_length, hand_width]):
-        player_input = {
+        # The typed inputs win over the selected prospect's stored values
+        player_input = dict(prospect_points.get(player_name, {}), **{
             'HEIGHT_WO_SHOES': height,
             'WINGSPAN': wingspan,
             'STANDING_REACH': reach,
             'HAND_LENGTH': hand_length,
             'HAND_WIDTH': hand_width
-        }
-
-        # Start with the full dataset
-        filtered_df = final_df.copy()
-        filtered_df['Pick'] = pd.to_numeric(filtered_df['Pick'], errors='coerce')
-        filtered_df['Minutes Played Per Game'] = pd.to_numeric(filtered_df['Minutes Played Per Game'], errors='coerce')
-
-
-        if "first_round" in filters:
-            filtered_df = filtered_df[filtered_df['Pick'] <= 30]
-
-        if "significant_minutes" in filters:
-            filtered_df = filtered_df[filtered_df['Minutes Played Per Game'] >= 10]  # Example threshold
+        })
 
-        if "was_drafted" in filters:
-            filtered_df = filtered_df[filtered_df['Pick'].notna()]
+        metrics.inc("comparisons_total")
 
-        distances_df = calculate_player_distances(filtered_df, player_input)
-        top_names = distances_df.head(6)['PLAYER_NAME'].tolist()
-        top_df = filtered_df[filtered_df['PLAYER_NAME'].isin(top_names)].copy()
-        top_df = top_df.merge(distances_df[['PLAYER_NAME', 'Distance']], on='PLAYER_NAME', how='left')
+        with metrics.span("similarity_search"):
+            positions, distances, fallback = data.query(player_input, k=6, filters=filters)
+        with metrics.span("top_rows"):
+            top_df = decode_rows(data.final_df.iloc[positions])
+            top_df['Distance'] = distances
 
-        display_df = top_df.drop(columns=['Distance', 'Name Lower', 'name_lower'], errors='ignore').copy()
+        display_df = top_df.drop(columns=['Distance', 'PLAYER_KEY'], errors='ignore').copy()
         clean_cols = [col.replace('_', ' ').title() for col in display_df.columns]
         col_map = dict(zip(display_df.columns, clean_cols))
 
@@ -233,15 +269,12 @@ def calculate_and_display(n_clicks, player_name, height, wingspan, reach, hand_l
         display_df = display_df.rename(columns={'Pick': 'Draft Pick #'})
 
 
-        table_rows = [html.Tr([html.Th("#")] + [html.Th(col) for col in display_df.columns])]
-
         # Build "You" or selected player row
         you_row = pd.Series(index=display_df.columns, dtype=object)
 
         if player_name:
-            matched = utah_players[utah_players["Player"] == player_name]
-            if not matched.empty:
-                row = matched.iloc[0]
+            row = prospect_index.get(player_name)
+            if row is not None:
                 renamed_row = row.rename({col: col.replace('_', ' ').title() for col in row.index})
                 for col in display_df.columns:
                     if col in renamed_row:
@@ -282,109 +315,47 @@ def calculate_and_display(n_clicks, player_name, height, wingspan, reach, hand_l
             })
             you_row["Player Name"] = "You"
 
-        row_cells = [html.Td("—")] + [
-            html.Td(str(you_row[col]) if pd.notna(you_row[col]) else "—") for col in display_df.columns
-        ]
-        table_rows.append(html.Tr(row_cells))
-
-        table_rows.append(html.Tr([html.Td("—") for _ in range(len(display_df.columns) + 1)]))
-
-        for i, (_, row) in enumerate(display_df.iterrows(), 1):
-            row_cells = [html.Td(f"{i}.")] + [html.Td(str(row[col]) if pd.notna(row[col]) else "—") for col in display_df.columns]
-            table_rows.append(html.Tr(row_cells))
-
-        player_table = html.Div([
-            html.Table(table_rows, className="data-table")
-        ], style={
-            "overflowX": "auto",
-            "maxWidth": "100%",
-            "border": "1px solid #ccc",
-            "padding": "10px",
-            "borderRadius": "10px",
-            "backgroundColor": "#f9f9f9"
-        })
-
-        exclude_fields = ['Height Wo Shoes', 'Wingspan', 'Standing Reach', 'Hand Length', 'Hand Width', 'Distance', 'Draft Pick #', 'Draftyear', 'Minutes Played Per Game']
-        avg_df = display_df.drop(columns=exclude_fields, errors="ignore")
-        numeric_df = avg_df.select_dtypes(include='number')
-        avg_values = numeric_df.mean().round(2)
-
-        averages_section = html.Div([
-            html.H3("Similar Player Average Metrics", style={"textAlign": "center", "marginTop": "30px"}),
-            html.Div([
-                html.Div([
-                    html.Div(col, className="metric-label"),
-                    html.Div(f"{val}", className="metric-value")
-                ], className="metric-box") for col, val in avg_values.items()
-            ], className="averages-container")
-        ])
-
-
-
-        utah_df = utah_players
-        selected_utah_row = utah_df[utah_df['Player'] == player_name]
-
-        selected_utah_row = selected_utah_row.rename(columns = {
-            'Player': 'Player Name',
-            'HEIGHT_WO_SHOES': 'Height Wo Shoes',
-            'WEIGHT': 'Weight',
-            'WINGSPAN': 'Wingspan',
-            'STANDING_REACH': 'Standing Reach',
-            'HAND_LENGTH': 'Hand Length',
-            'HAND_WIDTH': 'Hand Width',
-            'STANDING_VERTICAL_LEAP': 'Standing Vertical Leap',
-            'MAX_VERTICAL_LEAP': 'Max Vertical Leap',
-            'LANE_AGILITY_TIME': 'Lane Agility Time',
-            'MODIFIED_LANE_AGILITY_TIME': 'Modified Lane Agility Time',
-            'THREE_QUARTER_SPRINT': 'Three Quarter Sprint',
-            'BENCH_PRESS': 'Bench Press'
-        })
-
-        
-
-        graphs = []
-        
-        for col in numeric_df.columns:
-            
-            full_y = pd.concat([selected_utah_row[['Player Name', col]], display_df[['Player Name', col]]])
-            y_values = full_y[col]
-
-            player_name_col = full_y['Player Name']
-
-            sorted_vals = sorted(y_values.dropna())
-            y_min = sorted_vals[1] * 0.85 if len(sorted_vals) >= 2 and sorted_vals[0] == 0 else (sorted_vals[0] * 0.95 if sorted_vals else 0)
-            y_max = max(sorted_vals) * 1.15 if sorted_vals else 1
-
-            # Create color list: first bar red, rest steelblue
-            colors = ['#BE0000'] + ['steelblue'] * (len(full_y) - 1)
-
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=full_y['Player Name'],
-                    y=[v if v != "N/A" else 0 for v in full_y[col]],
-                    marker_color=colors,
-                    text=full_y[col],  
-                    textposition='outside' 
-                )
+        with metrics.span("table"):
+            player_table = comparison_table(display_df, you_row)
+        if fallback:
+            player_table = html.Div([
+                html.P("Too few players in the selected positions, so these comps cover all positions.",
+                       className="fallback-note"),
+                player_table,
             ])
 
-            fig.update_layout(
-                title=col,
-                height=300,
-                yaxis=dict(range=[y_min, y_max]),
-                xaxis_title='Player Name',
-                yaxis_title=col
+        with metrics.span("averages"):
+            exclude_fields = ['Height Wo Shoes', 'Wingspan', 'Standing Reach', 'Hand Length', 'Hand Width', 'Distance', 'Draft Pick #', 'Draftyear', 'Minutes Played Per Game']
+            avg_df = display_df.drop(columns=exclude_fields, errors="ignore")
+            numeric_df = avg_df.select_dtypes(include='number')
+            avg_values = numeric_df.mean().round(2)
+
+            # Percentiles of the comp averages and of the entered measurements
+            # against the whole combine history (and the checked position group)
+            ranks = data.percentiles
+            group = selected_group(filters)
+            avg_percentiles = ranks.rank({col.upper().replace(' ', '_'): val for col, val in avg_values.items()})
+
+            averages = averages_section(
+                avg_values,
+                percentiles=by_label(avg_percentiles),
+                prospect_values=by_label(player_input),
+                prospect_percentiles=by_label(ranks.rank(player_input)),
+                group_percentiles=by_label(ranks.rank(player_input, group)) if group else None,
+                group_label=POSITION_LABELS.get(group),
             )
 
+        selected_utah_row = prospect_chart_rows.get(player_name, no_prospect_chart_row)
 
-            graphs.append(dcc.Graph(figure=fig))
+        with metrics.span("figure"):
+            graphs = metric_comparison_figure(selected_utah_row, display_df, numeric_df.columns)
 
         graph_section = html.Div([
             html.H3("Metric Comparisons Across Closest Players", style={"textAlign": "center", "marginTop": "40px"}),
             html.Div(graphs)
         ])
 
-        return player_table, averages_section, graph_section
+        return player_table, averages, graph_section
 
 
     return "", "", ""
\ No newline at end of file
@@ -0,0 +1,68 @@
+import gc
+import multiprocessing
+import os
+
+# Production serving: gunicorn -c gunicorn.conf.py app:server
+#
+# The app is imported once in the master (preload_app), which then starts
+# loading the comparison dataset in the background. The master waits up to PRELOAD_WAIT
+# seconds for it (and for the loader thread to exit) before forking, so every worker
+# shares the loaded pages copy-on-write; the feature arrays the search reads
+# (block, presence mask, zero-filled copies and the position partitions, which
+# are slices of them) are memory-mapped from the artifact, so they stay shared
+# even when a worker touches them. If the load takes longer, the master
+# cancels its own load; without an artifact (building from source) it does not
+# start one. Each worker then loads on its own and reports not ready on
+# /readyz until then.
+bind = f"0.0.0.0:{os.environ.get('PORT', 8050)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+preload_app = True
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG")
+preload_wait = float(os.environ.get("PRELOAD_WAIT", 10))
+
+# Tells dashboard.py not to start its background threads on import; the hooks
+# below start them, so no refresher thread runs in the master. Of the workers'
+# refreshers one at a time holds the artifact lock and downloads; the others
+# only pick up the artifact it writes.
+os.environ["NBA_COMBINE_GUNICORN"] = "1"
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from dashboard import data_store
+    from utils.artifact import resolve_artifact
+
+    # Only a prebuilt artifact is loaded in the master. Building from source
+    # runs a pool of download threads, and the master must never fork while
+    # any thread of its own is still running.
+    if resolve_artifact() is None:
+        server.log.info("No dataset artifact, workers will build their own copy")
+        return
+
+    data_store.start()
+    if data_store.wait(preload_wait):
+        server.log.info("Dataset loaded, forking %s workers", server.cfg.workers)
+    else:
+        # Stop the master's load so it neither competes with the workers for
+        # CPU nor keeps a copy nobody shares; the loader stops at its next
+        # phase, which for an artifact is never far off
+        data_store.cancel()
+        server.log.info("Dataset still loading after %ss, workers will load their own copy", preload_wait)
+    data_store.thread.join()
+
+    # Move everything loaded so far out of the garbage collector's reach so
+    # collections in the workers do not write to (and copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Threads do not survive fork; restart the loader if the master had not
+    # finished loading yet (a no-op when the data is already there), and the
+    # season refresher if it is enabled
+    from dashboard import data_store, season_refresher
+
+    data_store.start()
+    season_refresher.start()
@@ -1,33 +1,40 @@
-import pandas as pd
-from utils.data_downloader import download_draft_combine_anthro_data, download_draft_combine_drill_data
-from utils.data_cleaner import clean_and_merge
-from components.distance_calculator import calculate_player_distances
-
-# Download data
-anthro_data_all = []
-drill_data_all = []
-
-for year in range(2000, 2025):
-    season = f"{year}-{str(year+1)[2:]}"
-    anthro_df = download_draft_combine_anthro_data(season=season)
-    anthro_df['Season'] = season
-    anthro_data_all.append(anthro_df)
-
-    drill_df = download_draft_combine_drill_data(season=season)
-    drill_df['Season'] = season
-    drill_data_all.append(drill_df)
-
-# Clean and merge data
-merged_df = clean_and_merge(anthro_data_all, drill_data_all)
-
-# Player of interest
-player_of_interest = {
-    'HEIGHT_WO_SHOES': 80,
-    'WINGSPAN': 85,
-    'STANDING_REACH': 108,
-    'HAND_LENGTH': 8.25,
-    'HAND_WIDTH': 8.75
-}
-
-# Calculate distances
-working_df = calculate_player_distances(merged_df, player_of_interest)
+import argparse
+from utils.data_downloader import season_label
+from utils.dataset import build_final_df
+from utils.artifact import ARTIFACT_DIR, write_artifact
+from utils.compact import compact_frame, memory_report
+from components.distance_calculator import SimilarityIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the versioned comparison dataset the dashboard loads at startup.")
+    parser.add_argument("--out", default=ARTIFACT_DIR, help="artifact root directory")
+    parser.add_argument("--start-year", type=int, default=2000)
+    parser.add_argument("--end-year", type=int, default=2024, help="last combine year, inclusive")
+    parser.add_argument("--cache-dir", default=None, help="season cache directory")
+    parser.add_argument("--offline", action="store_true", help="only use cached season data")
+    args = parser.parse_args()
+
+    seasons = [season_label(year) for year in range(args.start_year, args.end_year + 1)]
+
+    # Download, clean, merge and join
+    final_df = build_final_df(seasons, cache_dir=args.cache_dir, offline=args.offline or None)
+
+    # Store the frame in its compact layout
+    compact_df = compact_frame(final_df)
+
+    # Fit scaling and store the feature block with the frame
+    index = SimilarityIndex.from_frame(compact_df)
+
+    report = memory_report(final_df, compact_df, index)
+    print(f"Bytes per player: frame {report['bytes_per_player_before']:.0f} -> {report['bytes_per_player_after']:.0f}, "
+          f"feature index {report['index_bytes_per_player']:.0f}")
+    final_df = compact_df
+
+    version_dir, manifest = write_artifact(final_df, index, args.out, extra={"seasons": seasons})
+
+    print(f"Wrote {manifest['rows']} players to {version_dir} ({manifest['version']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import argparse
+from utils.artifact import ARTIFACT_DIR
+from utils.season_update import update_artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upsert one combine season into the current dataset artifact.")
+    parser.add_argument("--season", default=None, help="season label, e.g. 2025-26 (default: the current season)")
+    parser.add_argument("--artifact", default=None, help="artifact to update (default: the CURRENT one)")
+    parser.add_argument("--out", default=ARTIFACT_DIR, help="artifact root directory to write to")
+    parser.add_argument("--cache-dir", default=None, help="season cache directory")
+    parser.add_argument("--offline", action="store_true", help="only use cached season data")
+    args = parser.parse_args()
+
+    try:
+        update_artifact(args.season, args.artifact, args.out, cache_dir=args.cache_dir, offline=args.offline or None)
+    except FileNotFoundError as e:
+        raise SystemExit(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from components.distance_calculator import SimilarityIndex
+from components.player_filters import POSITION_FILTERS, position_groups
+
+# Layout written by process_data.py:
+#   artifacts/CURRENT                  name of the active version directory
+#   artifacts/combine-<hash>/final.parquet
+#   artifacts/combine-<hash>/features.npy   standardized float32 feature block, NaN where missing
+#   artifacts/combine-<hash>/present.npy    float32 presence mask (1 where measured)
+#   artifacts/combine-<hash>/filled.npy     feature block with 0 for missing values
+#   artifacts/combine-<hash>/filled_sq.npy  its square
+#   artifacts/combine-<hash>/manifest.json
+# Rows are grouped by position group, so the position partitions are views of
+# the memory-mapped blocks.
+ARTIFACT_DIR = os.environ.get("NBA_COMBINE_ARTIFACT_DIR", "artifacts")
+FORMAT_VERSION = 3
+
+# Arrays the distance computation reads, all memory-mapped on load
+INDEX_ARRAYS = ["present", "filled", "filled_sq"]
+
+
+def _sha256(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _group_order(final_df):
+    # Stable order that puts each position group's rows together
+    rank = {group: i for i, group in enumerate(sorted(set(POSITION_FILTERS.values())))}
+    codes = pd.Series(position_groups(final_df)).map(rank).fillna(len(rank)).to_numpy()
+    return np.argsort(codes, kind="stable")
+
+
+def write_artifact(final_df, index, out_dir=ARTIFACT_DIR, extra=None):
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".build-", dir=out_dir)
+
+    order = _group_order(final_df)
+    final_df = final_df.iloc[order]
+    index = index.subset(order)
+
+    frame_path = os.path.join(tmp_dir, "final.parquet")
+    features_path = os.path.join(tmp_dir, "features.npy")
+    final_df.reset_index(drop=True).to_parquet(frame_path, index=False)
+    np.save(features_path, index.scaled)
+    for name in INDEX_ARRAYS:
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(index, name))
+
+    sha256 = _sha256([frame_path, features_path] + [os.path.join(tmp_dir, f"{name}.npy") for name in INDEX_ARRAYS])
+    version = f"combine-{sha256[:12]}"
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "version": version,
+        "sha256": sha256,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "rows": len(final_df),
+        "features": index.features,
+        "mean": index.mean.tolist(),
+        "scale": index.scale.tolist(),
+        "weights": index.weights.tolist(),
+        "min_overlap": index.min_overlap,
+        "count": index.count.tolist(),
+        "m2": index.m2.tolist(),
+    }
+    if extra:
+        manifest.update(extra)
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    version_dir = os.path.join(out_dir, version)
+    if os.path.isdir(version_dir):
+        # Same content already built
+        shutil.rmtree(tmp_dir)
+    else:
+        os.replace(tmp_dir, version_dir)
+
+    pointer_tmp = os.path.join(out_dir, f".CURRENT.{os.getpid()}")
+    with open(pointer_tmp, "w") as f:
+        f.write(version + "\n")
+    os.replace(pointer_tmp, os.path.join(out_dir, "CURRENT"))
+
+    return version_dir, manifest
+
+
+def resolve_artifact(path=None):
+    # Accepts either a version directory or the artifacts root with a CURRENT pointer
+    path = path or os.environ.get("NBA_COMBINE_ARTIFACT") or ARTIFACT_DIR
+    if os.path.isfile(os.path.join(path, "manifest.json")):
+        return path
+    pointer = os.path.join(path, "CURRENT")
+    if os.path.isfile(pointer):
+        with open(pointer) as f:
+            version_dir = os.path.join(path, f.read().strip())
+        if os.path.isfile(os.path.join(version_dir, "manifest.json")):
+            return version_dir
+    return None
+
+
+def load_artifact(path=None, mmap=True):
+    version_dir = resolve_artifact(path)
+    if version_dir is None:
+        return None
+
+    with open(os.path.join(version_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        print(f"Ignoring artifact {version_dir}: format {manifest.get('format_version')} != {FORMAT_VERSION}")
+        return None
+
+    final_df = pd.read_parquet(os.path.join(version_dir, "final.parquet"))
+    # Memory-mapped so the feature blocks are file-backed and shared between processes
+    mmap_mode = "r" if mmap else None
+    scaled = np.load(os.path.join(version_dir, "features.npy"), mmap_mode=mmap_mode)
+    arrays = {name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode=mmap_mode) for name in INDEX_ARRAYS}
+    index = SimilarityIndex(scaled, manifest["mean"], manifest["scale"], manifest["features"],
+                            manifest["weights"], manifest["min_overlap"],
+                            manifest.get("count"), manifest.get("m2"), **arrays)
+
+    return final_df, index, manifest
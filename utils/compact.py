@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+# Compact in-memory layout of the comparison frame: repeated strings become
+# categoricals, measurements float32, and draft pick / year small integers
+# with MISSING standing in for "not drafted".
+MISSING = -1
+
+CATEGORY_COLUMNS = ['PLAYER_NAME', 'PLAYER_KEY', 'Season', 'POSITION']
+INT_COLUMNS = ['Pick', 'DraftYear']
+MEASUREMENT_COLUMNS = ['HEIGHT_WO_SHOES', 'WEIGHT', 'WINGSPAN', 'STANDING_REACH', 'HAND_LENGTH', 'HAND_WIDTH',
+                       'STANDING_VERTICAL_LEAP', 'MAX_VERTICAL_LEAP', 'LANE_AGILITY_TIME',
+                       'MODIFIED_LANE_AGILITY_TIME', 'THREE_QUARTER_SPRINT', 'BENCH_PRESS',
+                       'Minutes Played Per Game']
+
+
+def compact_frame(df):
+    conversions = {}
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            conversions[col] = lambda s: s.astype('category')
+    for col in INT_COLUMNS:
+        if col in df.columns and df[col].dtype != np.int16:
+            conversions[col] = lambda s: pd.to_numeric(s, errors='coerce').fillna(MISSING).astype(np.int16)
+    for col in MEASUREMENT_COLUMNS:
+        if col in df.columns and df[col].dtype != np.float32:
+            conversions[col] = lambda s: pd.to_numeric(s, errors='coerce').astype(np.float32)
+
+    # Already compact (e.g. loaded from an artifact): no copy
+    if not conversions:
+        return df
+
+    df = df.copy()
+    for col, convert in conversions.items():
+        df[col] = convert(df[col])
+    return df
+
+
+def append_rows(df, rows):
+    # Compact frame with `rows` (any layout, same columns) appended. Values new
+    # to a category column go after the existing categories, so the existing
+    # codes stay valid and only `rows` are converted; the columns are joined
+    # as plain arrays, without pandas comparing the categories again.
+    rows = compact_frame(rows[df.columns])
+    columns = {}
+    for col in df.columns:
+        old, new = df[col], rows[col]
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            extra = new.cat.categories.difference(old.cat.categories)
+            dtype = pd.CategoricalDtype(old.cat.categories.append(extra)) if len(extra) else old.dtype
+            recode = dtype.categories.get_indexer(new.cat.categories)
+            new_codes = new.cat.codes.to_numpy()
+            codes = np.concatenate([old.cat.codes.to_numpy(), np.where(new_codes < 0, -1, recode[new_codes])])
+            columns[col] = pd.Categorical.from_codes(codes, dtype=dtype)
+        else:
+            columns[col] = pd.concat([old, new], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def decode_rows(rows):
+    # Plain Python-friendly dtypes for the handful of rows that get displayed
+    # or serialized: sentinels back to NaN, float32 rounded to what was measured
+    rows = rows.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in rows.columns and isinstance(rows[col].dtype, pd.CategoricalDtype):
+            rows[col] = rows[col].astype(object)
+    for col in INT_COLUMNS:
+        if col in rows.columns:
+            rows[col] = rows[col].astype(np.float64).where(rows[col] != MISSING, np.nan)
+    for col in MEASUREMENT_COLUMNS:
+        if col in rows.columns and rows[col].dtype == np.float32:
+            rows[col] = rows[col].astype(np.float64).round(2)
+    return rows
+
+
+def memory_report(before, after, index=None):
+    # Bytes per player of the frame before and after compaction, plus the
+    # similarity index blocks that sit next to it
+    before_bytes = int(before.memory_usage(deep=True).sum())
+    after_bytes = int(after.memory_usage(deep=True).sum())
+    index_bytes = 0
+    if index is not None:
+        index_bytes = sum(a.nbytes for a in (index.scaled, index.present, index.filled, index.filled_sq))
+    players = max(len(after), 1)
+    return {
+        'players': len(after),
+        'bytes_before': before_bytes,
+        'bytes_after': after_bytes,
+        'index_bytes': index_bytes,
+        'bytes_per_player_before': before_bytes / players,
+        'bytes_per_player_after': after_bytes / players,
+        'index_bytes_per_player': index_bytes / players,
+    }
@@ -2,7 +2,7 @@ import pandas as pd
 import numpy as np
 import re
 
-def clean_and_merge(anthro_data, drill_data):
+def _combine_seasons(anthro_data, drill_data):
     # Filter out empty DataFrames
     anthro_data = [df for df in anthro_data if not df.empty and not df.isna().all(axis=1).all()]
     drill_data = [df for df in drill_data if not df.empty and not df.isna().all(axis=1).all()]
@@ -42,20 +42,59 @@ def clean_and_merge(anthro_data, drill_data):
     for col in numeric_drill_cols:
         combined_drill[col] = pd.to_numeric(combined_drill[col], errors='coerce')
 
-    # Merge and drop rows without key physical measurements
+    # Merge and drop rows without any key physical measurement; partially
+    # measured players are still compared on the features they have
     merged_df = pd.merge(combined_anthro, combined_drill, on=["PLAYER_NAME", "Season"], how="inner")
-    merged_df = merged_df.dropna(subset=['HEIGHT_WO_SHOES', 'WINGSPAN', 'STANDING_REACH', 'HAND_LENGTH', 'HAND_WIDTH'])
+    merged_df = merged_df.dropna(subset=['HEIGHT_WO_SHOES', 'WINGSPAN', 'STANDING_REACH', 'HAND_LENGTH', 'HAND_WIDTH'], how='all')
+
+    return merged_df
+
 
+def _most_recent_per_player(merged_df):
     # Sort by season descending (most recent first)
+    merged_df = merged_df.copy()
     merged_df['Season_Year'] = merged_df['Season'].str[:4].astype(int)  # convert '2024-25' → 2024
-    merged_df = merged_df.sort_values(by='Season_Year', ascending=False)
+    merged_df = merged_df.sort_values(by='Season_Year', ascending=False, kind='mergesort')
 
-    # Drop duplicates by player, keeping first non-null per column
-    def most_recent_non_null(group):
-        return group.ffill().bfill().iloc[0]
-
-    merged_df = merged_df.groupby("PLAYER_NAME", as_index=False).apply(most_recent_non_null).reset_index(drop=True)
+    # One row per player, keeping the most recent non-null value per column.
+    # groupby().first() skips nulls, so this matches ffill().bfill().iloc[0]
+    # on each group without a Python call per player.
+    merged_df = merged_df.groupby("PLAYER_NAME", as_index=False, sort=True).first()
     merged_df = merged_df.drop(columns=["Season_Year"])  # cleanup helper column
 
     return merged_df
 
+
+def clean_and_merge(anthro_data, drill_data):
+    return _most_recent_per_player(_combine_seasons(anthro_data, drill_data))
+
+
+def season_updates(merged_df, anthro_df, drill_df):
+    # Rows to replace when folding one season into an already merged table.
+    # Returns (affected, updated): a mask of the merged_df rows whose players
+    # appear in the season and their recombined rows, or None when the season
+    # adds nothing. The new season's values win over older ones, and over an
+    # earlier load of the same season, so mid-combine reloads replace values.
+    # Seasons are expected to arrive in chronological order, since the existing
+    # row for a player no longer records which season each value came from.
+    if anthro_df.empty or drill_df.empty:
+        return None
+    new_rows = _combine_seasons([anthro_df], [drill_df])
+    if new_rows.empty:
+        return None
+
+    affected = merged_df['PLAYER_NAME'].isin(new_rows['PLAYER_NAME']).to_numpy()
+    updated = _most_recent_per_player(pd.concat([new_rows, merged_df[affected]], ignore_index=True))
+    return affected, updated
+
+
+def merge_season(merged_df, anthro_df, drill_df):
+    # Fold one season into an already merged table. Only the rows of players
+    # who appear in the new season are recombined; everyone else is kept as is.
+    updates = season_updates(merged_df, anthro_df, drill_df)
+    if updates is None:
+        return merged_df
+    affected, updated = updates
+
+    result = pd.concat([merged_df[~affected], updated], ignore_index=True)
+    return result.sort_values(by='PLAYER_NAME', kind='mergesort').reset_index(drop=True)
@@ -1,42 +1,229 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
 import pandas as pd
 import requests
 
-def download_draft_combine_anthro_data(season="2024-25"):
-    url = f'https://stats.nba.com/stats/draftcombineplayeranthro?LeagueID=00&SeasonYear={season}'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-        'Origin': 'https://www.nba.com',
-        'Referer': 'https://www.nba.com/',
-        'Accept': 'application/json, text/plain, */*',
-    }
+BASE_URL = os.environ.get("NBA_STATS_BASE_URL", 'https://stats.nba.com/stats')
 
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    data = response.json()
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'Origin': 'https://www.nba.com',
+    'Referer': 'https://www.nba.com/',
+    'Accept': 'application/json, text/plain, */*',
+}
 
-    headers = data['resultSets'][0]['headers']
-    rows = data['resultSets'][0]['rowSet']
-    df = pd.DataFrame(rows, columns=headers)
+ANTHRO_ENDPOINT = 'draftcombineplayeranthro'
+DRILL_ENDPOINT = 'draftcombinedrillresults'
 
-    return df
+# Seasons before the current one never change, so they are served from disk
+# without touching the network. The current season is revalidated once it is
+# older than CURRENT_SEASON_MAX_AGE seconds. A `max_age` passed to the download
+# functions overrides both; max_age=0 always sends the conditional request.
+CACHE_DIR = os.environ.get("NBA_COMBINE_CACHE_DIR", "data_cache")
+OFFLINE = os.environ.get("NBA_COMBINE_OFFLINE", "0").lower() in ("1", "true", "yes")
+CURRENT_SEASON_MAX_AGE = int(os.environ.get("NBA_COMBINE_CURRENT_MAX_AGE", 6 * 60 * 60))
 
-def download_draft_combine_drill_data(season="2024-25"):
-    url = f'https://stats.nba.com/stats/draftcombinedrillresults?LeagueID=00&SeasonYear={season}'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-        'Origin': 'https://www.nba.com',
-        'Referer': 'https://www.nba.com/',
-        'Accept': 'application/json, text/plain, */*',
-    }
+REQUEST_TIMEOUT = 10
+MAX_RETRIES = 4
+BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    # Spaces requests evenly so at most `requests_per_second` start per second,
+    # shared by every thread using the limiter.
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def make_session(pool_size=10):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _retry_delay(response, attempt, backoff):
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return backoff * (2 ** attempt)
+
+
+def _get(url, headers, session=None, rate_limiter=None, timeout=REQUEST_TIMEOUT,
+         max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS):
+    getter = session.get if session is not None else requests.get
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        try:
+            response = getter(url, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+            continue
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            time.sleep(_retry_delay(response, attempt, backoff))
+            continue
+        return response
+
+
+def season_label(year):
+    return f"{year}-{str(year+1)[2:]}"
+
+
+def current_season():
+    return season_label(date.today().year)
+
+
+def _cache_path(endpoint, season, cache_dir):
+    return os.path.join(cache_dir, endpoint, f"{season}.json")
 
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
+
+def _read_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path, entry):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+
+def _to_dataframe(result_sets):
+    headers = result_sets[0]['headers']
+    rows = result_sets[0]['rowSet']
+    return pd.DataFrame(rows, columns=headers)
+
+
+def _fetch_result_sets(endpoint, season, cache_dir=None, offline=None, base_url=None, max_age=None,
+                       **request_options):
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    offline = OFFLINE if offline is None else offline
+    if max_age is None:
+        max_age = CURRENT_SEASON_MAX_AGE if season >= current_season() else float('inf')
+
+    path = _cache_path(endpoint, season, cache_dir)
+    cached = _read_cache(path)
+
+    if offline:
+        if cached is None:
+            print(f"Offline mode: no cached {endpoint} data for {season}")
+            return None
+        return cached['resultSets']
+
+    if cached is not None and time.time() - cached.get('fetched_at', 0) < max_age:
+        return cached['resultSets']
+
+    # Conditional request so an unchanged current season costs a 304
+    headers = dict(HEADERS)
+    if cached is not None:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    url = f'{base_url or BASE_URL}/{endpoint}?LeagueID=00&SeasonYear={season}'
+    try:
+        response = _get(url, headers, **request_options)
+        if response.status_code == 304 and cached is not None:
+            cached['fetched_at'] = time.time()
+            _write_cache(path, cached)
+            return cached['resultSets']
+        response.raise_for_status()
+    except requests.RequestException:
+        if cached is None:
+            raise
+        print(f"Revalidation of {endpoint} {season} failed, serving cached copy")
+        return cached['resultSets']
 
     data = response.json()
+    entry = {
+        'endpoint': endpoint,
+        'season': season,
+        'fetched_at': time.time(),
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'resultSets': data['resultSets'],
+    }
+    _write_cache(path, entry)
+    return entry['resultSets']
+
+
+def download_draft_combine_anthro_data(season="2024-25", cache_dir=None, offline=None, max_age=None):
+    result_sets = _fetch_result_sets(ANTHRO_ENDPOINT, season, cache_dir, offline, max_age=max_age)
+    if result_sets is None:
+        return pd.DataFrame()
+    return _to_dataframe(result_sets)
+
+def download_draft_combine_drill_data(season="2024-25", cache_dir=None, offline=None, max_age=None):
+    result_sets = _fetch_result_sets(DRILL_ENDPOINT, season, cache_dir, offline, max_age=max_age)
+    if result_sets is None:
+        return pd.DataFrame()
+    return _to_dataframe(result_sets)
+
+
+def download_draft_combine_seasons(seasons, max_workers=8, requests_per_second=4.0,
+                                   timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES,
+                                   backoff=BACKOFF_SECONDS, cache_dir=None, offline=None,
+                                   base_url=None, session=None):
+    # Fetch anthro and drill data for every season concurrently over one
+    # keep-alive session. Returns two lists of per-season DataFrames, in the
+    # order of `seasons`, each with a Season column, ready for clean_and_merge.
+    seasons = list(seasons)
+    own_session = session is None
+    if own_session:
+        session = make_session(pool_size=max_workers)
+    request_options = {
+        'session': session,
+        'rate_limiter': RateLimiter(requests_per_second),
+        'timeout': timeout,
+        'max_retries': max_retries,
+        'backoff': backoff,
+    }
 
-    headers = data['resultSets'][0]['headers']
-    rows = data['resultSets'][0]['rowSet']
+    def fetch(endpoint, season):
+        result_sets = _fetch_result_sets(endpoint, season, cache_dir, offline, base_url, **request_options)
+        df = pd.DataFrame() if result_sets is None else _to_dataframe(result_sets)
+        df['Season'] = season
+        return df
 
-    df = pd.DataFrame(rows, columns=headers)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            anthro_futures = [pool.submit(fetch, ANTHRO_ENDPOINT, season) for season in seasons]
+            drill_futures = [pool.submit(fetch, DRILL_ENDPOINT, season) for season in seasons]
+            anthro_data_all = [f.result() for f in anthro_futures]
+            drill_data_all = [f.result() for f in drill_futures]
+    finally:
+        if own_session:
+            session.close()
 
-    return df
\ No newline at end of file
+    return anthro_data_all, drill_data_all
@@ -0,0 +1,213 @@
+import threading
+import traceback
+
+import numpy as np
+
+from utils.data_downloader import download_draft_combine_seasons, season_label
+from utils.data_cleaner import clean_and_merge
+from utils.player_loader import load_custom_players
+from utils.player_keys import KeyTables, join_draft_and_minutes
+from utils import metrics
+from utils.metrics import startup_phase, log_startup
+from utils.compact import append_rows, compact_frame
+from components.distance_calculator import SimilarityIndex
+from components.player_filters import build_filter_masks, combine_masks, position_groups
+from components.position_partitions import PositionPartitions, split_filters
+from components.percentiles import PercentileTables
+
+SEASONS = [season_label(year) for year in range(2000, 2025)]
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+def check_cancelled(cancelled):
+    # Called between load phases, so a cancelled load stops at the next one
+    if cancelled is not None and cancelled.is_set():
+        raise LoadCancelled()
+
+
+def load_key_tables():
+    return KeyTables(load_custom_players("draft_players.csv"), load_custom_players("minutes_per_player.csv"))
+
+
+def join_player_info(merged_df, tables):
+    # Join on normalized player keys so every combine participant keeps
+    # exactly one row, and report the names that did not match
+    final_df, report = join_draft_and_minutes(merged_df, tables)
+
+    for table, names in (('draft', report['draft_unmatched']), ('minutes', report['minutes_unmatched'])):
+        if names:
+            print(f"{len(names)} {table} names without a combine match, e.g. {names[:5]}")
+
+    return final_df
+
+
+def build_final_df(seasons=SEASONS, cancelled=None, timed=True, **download_options):
+    with startup_phase("download", timed):
+        anthro_data_all, drill_data_all = download_draft_combine_seasons(seasons, **download_options)
+    check_cancelled(cancelled)
+    with startup_phase("clean_and_merge", timed):
+        merged_df = clean_and_merge(anthro_data_all, drill_data_all)
+    check_cancelled(cancelled)
+
+    with startup_phase("join", timed):
+        final_df = join_player_info(merged_df, load_key_tables())
+
+    return final_df
+
+
+class ComparisonData:
+    # Everything a similarity query needs: the joined frame in its compact
+    # layout (see utils/compact.py), the feature index built from it, its
+    # position partitions, the precomputed filter masks, the percentile tables
+    # and the artifact version. Pieces already built (see upsert) are passed in
+    # instead of being derived from the frame again. Only the initial load
+    # (timed=True) counts towards the startup metrics.
+    def __init__(self, final_df, index=None, version=None, groups=None, filter_masks=None, percentiles=None,
+                 timed=False):
+        with startup_phase("compact", timed):
+            final_df = compact_frame(final_df)
+        self.final_df = final_df
+        with startup_phase("index_build", timed):
+            self.index = index if index is not None else SimilarityIndex.from_frame(final_df)
+        self.version = version
+        # Shared by the position filters, partitions and percentile tables
+        self.groups = groups if groups is not None else position_groups(final_df)
+        with startup_phase("filter_masks", timed):
+            self.filter_masks = filter_masks if filter_masks is not None else build_filter_masks(final_df, self.groups)
+        with startup_phase("partitions", timed):
+            self.partitions = PositionPartitions.from_frame(final_df, self.index, groups=self.groups)
+        with startup_phase("percentiles", timed):
+            self.percentiles = percentiles if percentiles is not None else PercentileTables.from_frame(
+                final_df, groups=self.groups)
+
+    def upsert(self, keep, rows, version):
+        # New ComparisonData holding the rows selected by the boolean `keep`
+        # followed by the joined `rows`. Only `rows` are compacted, mapped to
+        # position groups and run through the filters; the index and the
+        # percentile tables are updated from the removed and added rows. The
+        # partitions are cut again, since every row's scaling changes.
+        final_df = append_rows(self.final_df[keep], rows)
+        added = final_df.iloc[int(keep.sum()):]
+        added_groups = position_groups(added)
+        index = self.index.upsert(keep, added.reindex(columns=self.index.features))
+        added_masks = build_filter_masks(added, added_groups)
+        filter_masks = {value: np.concatenate([mask[keep], added_masks[value]]) for value, mask in self.filter_masks.items()}
+        percentiles = self.percentiles.upsert(self.final_df[~keep], self.groups[~keep], added, added_groups)
+        return ComparisonData(final_df, index, version, np.concatenate([self.groups[keep], added_groups]),
+                              filter_masks, percentiles)
+
+    def query_many(self, points, k=6, filters=None, weights=None):
+        # Top-k comps for checklist filters, as (positions, distances,
+        # fallback). Position filters are pushed down to the partitions; if
+        # those are too small the search covers every position, only the other
+        # filters apply and fallback is True so callers can say so.
+        groups, others = split_filters(filters)
+        mask = combine_masks(self.filter_masks, others)
+        if groups:
+            result = self.partitions.query_many(points, groups, k=k, mask=mask, weights=weights)
+            if result is not None:
+                return result + (False,)
+            metrics.inc("position_fallback_total")
+        return self.index.query_many(points, k=k, mask=mask, weights=weights) + (bool(groups),)
+
+    def query(self, point, k=6, filters=None, weights=None):
+        positions, distances, fallback = self.query_many([point], k=k, filters=filters, weights=weights)
+        scored = np.isfinite(distances[0])
+        return positions[0][scored], distances[0][scored], fallback
+
+
+def load_comparison_data(artifact_path=None, cancelled=None, timed=True):
+    # Prefer the prebuilt artifact from process_data.py and only fall back to
+    # downloading and merging when none is available. Setting the `cancelled`
+    # event stops the load at the next phase with LoadCancelled. Reloads pass
+    # timed=False to stay out of the startup metrics.
+    from utils.artifact import load_artifact
+
+    with startup_phase("artifact_load", timed):
+        loaded = load_artifact(artifact_path)
+    check_cancelled(cancelled)
+    if loaded is not None:
+        final_df, index, manifest = loaded
+        print(f"Loaded dataset artifact {manifest['version']} ({manifest['rows']} players)")
+        return ComparisonData(final_df, index, manifest['version'], timed=timed)
+
+    print("No dataset artifact found, building from source")
+    final_df = build_final_df(cancelled=cancelled, timed=timed)
+    check_cancelled(cancelled)
+    return ComparisonData(final_df, timed=timed)
+
+
+class DataStore:
+    # Holds the live ComparisonData. The dataset is loaded on a background
+    # thread so the server can bind and answer health checks right away;
+    # get() returns None until the first load has finished. The loader is
+    # called with a threading.Event that cancel() sets.
+    def __init__(self, loader=load_comparison_data):
+        self.loader = loader
+        self.data = None
+        self.error = None
+        self.thread = None
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+
+    def start(self):
+        # Safe to call again, e.g. in a forked worker where the loader thread
+        # did not survive the fork
+        with self.lock:
+            if self.ready.is_set() or (self.thread is not None and self.thread.is_alive()):
+                return
+            self.error = None
+            self.cancelled = threading.Event()
+            self.thread = threading.Thread(target=self._load, args=(self.cancelled,), name="dataset-loader",
+                                           daemon=True)
+            self.thread.start()
+
+    def cancel(self):
+        # Give up on a load in progress, e.g. in the gunicorn master once the
+        # workers are forked to load their own copy. The loader stops at its
+        # next phase and whatever it built is dropped.
+        self.cancelled.set()
+
+    def _load(self, cancelled):
+        try:
+            data = self.loader(cancelled=cancelled)
+            check_cancelled(cancelled)
+        except LoadCancelled:
+            print("Loading the comparison data was cancelled")
+            return
+        except Exception as e:
+            self.error = e
+            print("Loading the comparison data failed:")
+            traceback.print_exc()
+            return
+        print("Merged DataFrame Columns:", data.final_df.columns.tolist())
+        log_startup()
+        # Last, so whoever waits on the load (gunicorn's when_ready) only goes
+        # on once this thread has nothing left to do
+        self.swap(data)
+
+    def swap(self, data):
+        # Replace the live data in one assignment; requests already running
+        # keep the object they started with
+        self.data = data
+        self.ready.set()
+
+    def get(self):
+        return self.data
+
+    def wait(self, timeout=None):
+        return self.ready.wait(timeout)
+
+    def status(self):
+        data = self.data
+        return {
+            "ready": data is not None,
+            "version": data.version if data is not None else None,
+            "players": len(data.final_df) if data is not None else 0,
+            "loading": self.thread is not None and self.thread.is_alive(),
+            "error": repr(self.error) if self.error is not None else None,
+        }
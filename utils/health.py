@@ -0,0 +1,18 @@
+import json
+
+from flask import Response
+
+
+def register_health_routes(server, store):
+    # /healthz answers as soon as the process is up (liveness); /readyz only
+    # once the comparison data is loaded (readiness), so the load balancer
+    # holds traffic back without restarting a container that is still warming up.
+    @server.route('/healthz')
+    def healthz():
+        return Response(json.dumps({'status': 'ok'}), mimetype='application/json')
+
+    @server.route('/readyz')
+    def readyz():
+        status = store.status()
+        return Response(json.dumps(status), status=200 if status['ready'] else 503,
+                        mimetype='application/json')
@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response
+
+# Timing spans are only recorded when METRICS_ENABLED is set; otherwise span()
+# hands back a shared no-op object and costs one attribute lookup per phase.
+ENABLED = os.environ.get("METRICS_ENABLED", "0").lower() in ("1", "true", "yes")
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "nba_combine"
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_phases = OrderedDict()
+_counters = OrderedDict()
+_startup = OrderedDict()
+_collectors = []
+
+
+def observe(phase, seconds):
+    with _lock:
+        histogram = _phases.get(phase)
+        if histogram is None:
+            histogram = _phases[phase] = Histogram()
+        histogram.observe(seconds)
+
+
+def inc(name, amount=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+class _Span:
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.phase, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(phase):
+    return _Span(phase) if ENABLED else _NOOP
+
+
+class startup_phase:
+    # Startup phases are always timed, they run once per process. Code shared
+    # with later rebuilds passes enabled=False there, so the totals only ever
+    # cover the initial load.
+    def __init__(self, phase, enabled=True):
+        self.phase = phase
+        self.enabled = enabled
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.enabled:
+            return False
+        _startup[self.phase] = _startup.get(self.phase, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+def log_startup():
+    if not _startup:
+        return
+    total = sum(_startup.values())
+    parts = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in _startup.items())
+    print(f"Startup took {total:.2f}s: {parts}")
+
+
+def register_collector(collect):
+    # collect() returns extra {metric_name: value} pairs exported as counters
+    _collectors.append(collect)
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+def render():
+    lines = []
+    with _lock:
+        if _phases:
+            lines.append(f"# HELP {PREFIX}_phase_seconds Time spent in named request phases.")
+            lines.append(f"# TYPE {PREFIX}_phase_seconds histogram")
+            for phase, histogram in _phases.items():
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{PREFIX}_phase_seconds_bucket{_labels(phase=phase, le=bound)} {cumulative}")
+                lines.append(f"{PREFIX}_phase_seconds_bucket{_labels(phase=phase, le='+Inf')} {histogram.count}")
+                lines.append(f"{PREFIX}_phase_seconds_sum{_labels(phase=phase)} {histogram.sum}")
+                lines.append(f"{PREFIX}_phase_seconds_count{_labels(phase=phase)} {histogram.count}")
+
+        counters = dict(_counters)
+        for collect in _collectors:
+            counters.update(collect())
+        for name, value in counters.items():
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            lines.append(f"{PREFIX}_{name} {value}")
+
+        if _startup:
+            lines.append(f"# HELP {PREFIX}_startup_seconds Time spent in each startup phase.")
+            lines.append(f"# TYPE {PREFIX}_startup_seconds gauge")
+            for phase, seconds in _startup.items():
+                lines.append(f"{PREFIX}_startup_seconds{_labels(phase=phase)} {seconds}")
+
+    return "\n".join(lines) + "\n"
+
+
+def register_metrics_route(server):
+    @server.route('/metrics')
+    def metrics():
+        if not ENABLED:
+            return Response("metrics disabled, set METRICS_ENABLED=1\n", status=404, mimetype='text/plain')
+        return Response(render(), mimetype='text/plain; version=0.0.4')
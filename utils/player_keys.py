@@ -0,0 +1,142 @@
+import pandas as pd
+
+# Generational suffixes. They stay in player keys ("Jr." and "Jr" both become
+# "jr") so fathers and sons are not merged; the suffix-less base key is only a
+# fallback for sources that omit the suffix.
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# A draft row matched on the base key alone must be this close to the combine year
+MAX_DRAFT_GAP = 3
+
+
+def player_keys(names):
+    # Vectorized over the distinct names, then mapped back. The regex steps
+    # run on Arrow strings, so they avoid lookarounds.
+    names = pd.Series(names, dtype=object)
+    unique = pd.Series(names.dropna().unique(), dtype=object)
+
+    # Strip accents: "Dario Šarić" -> "dario saric"
+    keys = unique.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+    keys = keys.astype('string[pyarrow]').str.lower()
+
+    # Drop periods and apostrophes inside names, everything else separates words
+    keys = keys.str.replace(r"[.']", "", regex=True)
+    keys = keys.str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip()
+
+    # Join pairs of initials so "A. J. Green" and "AJ Green" agree
+    keys = keys.str.replace(r"\b([a-z]) ([a-z])\b", r"\1\2", regex=True)
+    keys = keys.astype(object).where(keys != "", None)
+
+    return names.map(dict(zip(unique, keys)))
+
+
+def base_keys(keys):
+    # Player keys without a trailing suffix: "gary trent jr" -> "gary trent"
+    keys = pd.Series(keys, dtype=object)
+    suffixes = "|".join(sorted(SUFFIXES, key=len, reverse=True))
+    return keys.str.replace(rf" (?:{suffixes})$", "", regex=True)
+
+
+def normalize_name(name):
+    if not isinstance(name, str):
+        return None
+    key = player_keys([name]).iloc[0]
+    return key if isinstance(key, str) else None
+
+
+def clean_draft_table(playerStats):
+    # draft_players.csv repeats its header ("Player", "Round 2") inside every
+    # draft year; keep only rows with a numeric pick
+    playerStats = playerStats.copy()
+    playerStats['Pick'] = pd.to_numeric(playerStats['Pick'], errors='coerce')
+    playerStats['DraftYear'] = pd.to_numeric(playerStats['DraftYear'], errors='coerce')
+    playerStats = playerStats[playerStats['Pick'].notna()]
+    playerStats['PLAYER_KEY'] = player_keys(playerStats['Player']).to_numpy()
+    return playerStats.reset_index(drop=True)
+
+
+def aggregate_minutes(playerMinutes, keys=None):
+    # Returns (career, per_season): career has one row per player key with the
+    # average minutes per game across seasons and the first and last season,
+    # per_season one row per key and season.
+    playerMinutes = playerMinutes.copy()
+    playerMinutes['MP'] = pd.to_numeric(playerMinutes['MP'], errors='coerce')
+    playerMinutes['Season'] = pd.to_numeric(playerMinutes['Season'], errors='coerce')
+    playerMinutes['PLAYER_KEY'] = (keys if keys is not None else player_keys(playerMinutes['Player'])).to_numpy()
+    playerMinutes = playerMinutes.dropna(subset=['PLAYER_KEY'])
+
+    per_season = (playerMinutes.groupby(['PLAYER_KEY', 'Season'], as_index=False)['MP'].mean())
+    career = per_season.groupby('PLAYER_KEY').agg(
+        **{'Minutes Played Per Game': ('MP', 'mean'), 'Seasons Played': ('MP', 'size'),
+           'FirstSeason': ('Season', 'min'), 'LastSeason': ('Season', 'max')}
+    ).reset_index()
+
+    return career, per_season
+
+
+class KeyTables:
+    # The draft and minutes tables keyed once, so every join (the full build
+    # and each season update) reuses them instead of renormalizing the names
+    def __init__(self, playerStats, playerMinutes):
+        self.draft = clean_draft_table(playerStats)
+        self.draft['BASE_KEY'] = base_keys(self.draft['PLAYER_KEY']).to_numpy()
+
+        keys = player_keys(playerMinutes['Player'])
+        self.minute_names = playerMinutes['Player'].dropna()
+        self.minute_keys = keys.loc[self.minute_names.index]
+        self.career, _ = aggregate_minutes(playerMinutes, keys)
+        self.career['BASE_KEY'] = base_keys(self.career['PLAYER_KEY']).to_numpy()
+
+
+def _best_match(final_df, table, valid, gap):
+    # Row of `table` chosen for each combine row, as a frame indexed by the
+    # final_df position. Candidates share the base key; valid(candidates)
+    # rules out impossible ones, then the exact key wins over the base key
+    # and the smallest gap(candidates) breaks the remaining ties.
+    combine = final_df[['PLAYER_KEY', 'BASE_KEY', 'CombineYear']].reset_index().dropna(subset=['BASE_KEY'])
+    table = table.rename(columns={'PLAYER_KEY': 'MATCH_KEY'}).reset_index(names='row').dropna(subset=['BASE_KEY'])
+    candidates = combine.merge(table, on='BASE_KEY', how='inner')
+    candidates['inexact'] = candidates['PLAYER_KEY'] != candidates['MATCH_KEY']
+    candidates['gap'] = gap(candidates)
+    candidates = candidates[valid(candidates)]
+    candidates = candidates.sort_values(['index', 'inexact', 'gap'], kind='mergesort')
+    return candidates.drop_duplicates(subset='index', keep='first').set_index('index')
+
+
+def join_draft_and_minutes(merged_df, tables, with_report=True):
+    # Returns (final_df, report). final_df has exactly one row per row of
+    # merged_df; report lists the draft and minutes names that matched nobody,
+    # or is None without with_report (it sorts every unmatched name).
+    final_df = merged_df.reset_index(drop=True).copy()
+    final_df['PLAYER_KEY'] = player_keys(final_df['PLAYER_NAME']).to_numpy()
+    keyed = final_df.assign(
+        BASE_KEY=base_keys(final_df['PLAYER_KEY']).to_numpy(),
+        CombineYear=pd.to_numeric(final_df['Season'].astype(str).str[:4], errors='coerce').to_numpy(),
+    )
+
+    # Several draftees can share a key (two Justin Jacksons); pick the one
+    # drafted closest to the player's combine year. A draftee matching only
+    # without the suffix must have been drafted around the combine.
+    draft_gap = lambda c: (c['DraftYear'] - c['CombineYear']).abs()
+    best = _best_match(keyed, tables.draft,
+                       lambda c: ~c['inexact'] | (c['gap'] <= MAX_DRAFT_GAP), draft_gap)
+    final_df['Pick'] = best['Pick'].reindex(final_df.index)
+    final_df['DraftYear'] = best['DraftYear'].reindex(final_df.index)
+
+    # Minutes logged only before the combine belong to someone else, usually
+    # the father ("Gary Payton" for Gary Payton II)
+    minutes_gap = lambda c: (c['FirstSeason'] - c['CombineYear']).abs()
+    career = _best_match(keyed, tables.career,
+                         lambda c: c['LastSeason'] >= c['CombineYear'] - 1, minutes_gap)
+    final_df['Minutes Played Per Game'] = career['Minutes Played Per Game'].reindex(final_df.index)
+    if not with_report:
+        return final_df, None
+
+    draft_rows = tables.draft.index.isin(best['row'])
+    minute_keys = career['MATCH_KEY'].unique()
+    report = {
+        'draft_unmatched': sorted(tables.draft.loc[~draft_rows, 'Player'].unique()),
+        'minutes_unmatched': sorted(tables.minute_names.loc[~tables.minute_keys.isin(minute_keys)].unique()),
+    }
+
+    return final_df, report
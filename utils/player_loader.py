@@ -2,4 +2,19 @@ import pandas as pd
 
 def load_custom_players(path = "utah_players.csv"):
     df = pd.read_csv(path)
-    return df
\ No newline at end of file
+    return df
+
+PREFILL_COLUMNS = ['HEIGHT_WO_SHOES', 'WINGSPAN', 'STANDING_REACH', 'HAND_LENGTH', 'HAND_WIDTH']
+
+
+def build_prospect_index(df, name_column="Player"):
+    # Name -> row, first row wins for repeated names
+    df = df.drop_duplicates(subset=name_column, keep="first")
+    return {row[name_column]: row for _, row in df.iterrows()}
+
+
+def prospect_store_data(df, name_column="Player", columns=PREFILL_COLUMNS):
+    # JSON-safe {name: [measurements]} for the client-side input prefill
+    df = df.drop_duplicates(subset=name_column, keep="first")
+    values = df[columns].astype(object).where(df[columns].notna(), None)
+    return dict(zip(df[name_column], values.values.tolist()))
@@ -0,0 +1,183 @@
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+
+import pandas as pd
+
+from utils.data_cleaner import season_updates
+from utils.data_downloader import (current_season, download_draft_combine_anthro_data,
+                                   download_draft_combine_drill_data)
+from utils.artifact import ARTIFACT_DIR, load_artifact, resolve_artifact, write_artifact
+from utils.compact import compact_frame, decode_rows
+from utils.dataset import ComparisonData, load_comparison_data, load_key_tables
+from utils.player_keys import join_draft_and_minutes
+
+# Columns added by the draft/minutes join, redone for the players a season touches
+JOIN_COLUMNS = ['PLAYER_KEY', 'Pick', 'DraftYear', 'Minutes Played Per Game']
+
+# Seconds between background refreshes of the current season; 0 disables them
+REFRESH_INTERVAL = float(os.environ.get("NBA_COMBINE_REFRESH_INTERVAL", 0))
+
+# Seconds between checks of the artifact's CURRENT pointer for a new version
+RELOAD_POLL = 5
+
+
+def _update_version(version, season, anthro_df, drill_df):
+    # Derived from the previous version and the new data, so the API cache
+    # never serves results from before the update
+    digest = hashlib.sha256((version or "").encode())
+    for df in (anthro_df, drill_df):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    root = (version or "live").split("+")[0]
+    return f"{root}+{season}.{digest.hexdigest()[:8]}"
+
+
+def _same_rows(old, new):
+    # Compared in the stored (compact) precision, so reloading an unchanged
+    # season is a no-op
+    # Sorted after decoding: appended categories are not in alphabetical order
+    old = decode_rows(old).sort_values('PLAYER_NAME', kind='mergesort').reset_index(drop=True)
+    new = decode_rows(compact_frame(new[old.columns])).reset_index(drop=True)
+    old, new = old.astype(object), new.astype(object)
+    return old.where(old.notna(), None).equals(new.where(new.notna(), None))
+
+
+# Draft and minutes key tables, loaded on the first update and reused after
+_key_tables = None
+
+
+def key_tables():
+    global _key_tables
+    if _key_tables is None:
+        _key_tables = load_key_tables()
+    return _key_tables
+
+
+def upsert_season(data, anthro_df, drill_df, season, tables=None):
+    # New ComparisonData with one season's players appended or replaced.
+    # Only the touched players are recombined and rejoined (against the key
+    # tables loaded once), and everything derived from the frame is updated
+    # from their rows (see ComparisonData.upsert). `data` itself is left
+    # untouched, so requests already running on it are unaffected.
+    # Returns `data` unchanged when the season brings nothing new.
+    anthro_df = anthro_df.assign(Season=season) if not anthro_df.empty else anthro_df
+    drill_df = drill_df.assign(Season=season) if not drill_df.empty else drill_df
+
+    final_df = data.final_df
+    merged_columns = [c for c in final_df.columns if c not in JOIN_COLUMNS]
+    updates = season_updates(final_df[merged_columns], anthro_df, drill_df)
+    if updates is None:
+        return data
+    affected, updated = updates
+
+    updated, _ = join_draft_and_minutes(updated, tables or key_tables(), with_report=False)
+    if len(updated) == affected.sum() and _same_rows(final_df[affected], updated):
+        return data
+
+    version = _update_version(data.version, season, anthro_df, drill_df)
+    print(f"Season {season}: {int(affected.sum())} players updated, "
+          f"{len(updated) - int(affected.sum())} added ({version})")
+    return data.upsert(~affected, updated, version)
+
+
+def update_artifact(season=None, artifact=None, out_dir=ARTIFACT_DIR, tables=None, **download_options):
+    # Download one season (by default the current one), upsert it into the
+    # artifact and write the result to out_dir, flipping its CURRENT pointer.
+    # The cached copy is always revalidated, a 304 when nothing changed,
+    # unless max_age says otherwise. Returns the new version directory, or
+    # None when the season brings nothing new.
+    loaded = load_artifact(artifact)
+    if loaded is None:
+        raise FileNotFoundError("No dataset artifact to update, run process_data.py first")
+    final_df, index, manifest = loaded
+    data = ComparisonData(final_df, index, manifest["version"])
+
+    season = season or current_season()
+    download_options.setdefault('max_age', 0)
+    anthro_df = download_draft_combine_anthro_data(season, **download_options)
+    drill_df = download_draft_combine_drill_data(season, **download_options)
+
+    updated = upsert_season(data, anthro_df, drill_df, season, tables)
+    if updated is data:
+        print(f"Season {season} has no new measurements, {manifest['version']} is up to date")
+        return None
+
+    seasons = sorted(set(manifest.get("seasons", [])) | {season})
+    version_dir, new_manifest = write_artifact(updated.final_df, updated.index, out_dir,
+                                               extra={"seasons": seasons, "updated_from": manifest["version"]})
+    print(f"Wrote {new_manifest['rows']} players to {version_dir} ({new_manifest['version']})")
+    return version_dir
+
+
+def artifact_version(version_dir):
+    with open(os.path.join(version_dir, "manifest.json")) as f:
+        return json.load(f)["version"]
+
+
+class SeasonRefresher:
+    # Background thread that keeps the current season fresh while the
+    # combine is running. Only one process refreshes: whichever holds the
+    # lock file in the artifact root downloads the season every `interval`
+    # seconds and writes a new artifact (see update_artifact). Every process,
+    # that one included, watches the root's CURRENT pointer and swaps in the
+    # memory-mapped artifact it names, so workers keep sharing one copy and
+    # stats.nba.com sees one client. Like DataStore.start(), start() is safe
+    # to call again after a fork.
+    def __init__(self, store, interval=REFRESH_INTERVAL, root=None):
+        self.store = store
+        self.interval = interval
+        self.root = root or os.environ.get("NBA_COMBINE_ARTIFACT") or ARTIFACT_DIR
+        self.lock_file = None
+        self.thread = None
+
+    def start(self):
+        if self.interval <= 0 or (self.thread is not None and self.thread.is_alive()):
+            return
+        if os.path.isfile(os.path.join(self.root, "manifest.json")):
+            print(f"Not refreshing the current season: {self.root} is a single artifact version, "
+                  f"point NBA_COMBINE_ARTIFACT at the artifact root instead")
+            return
+        self.thread = threading.Thread(target=self._run, name="season-refresher", daemon=True)
+        self.thread.start()
+
+    def elected(self):
+        # Held until the process exits, when another one takes over
+        if self.lock_file is None:
+            os.makedirs(self.root, exist_ok=True)
+            lock_file = open(os.path.join(self.root, ".refresh.lock"), "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self.lock_file = lock_file
+        return True
+
+    def reload(self):
+        # Swap in the artifact CURRENT names if it is not the live version
+        version_dir = resolve_artifact(self.root)
+        data = self.store.get()
+        if version_dir is None or (data is not None and data.version == artifact_version(version_dir)):
+            return
+        self.store.swap(load_comparison_data(version_dir, timed=False))
+
+    def _run(self):
+        self.store.wait()
+        next_refresh = time.monotonic() + self.interval
+        while True:
+            time.sleep(min(self.interval, RELOAD_POLL))
+            try:
+                if time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + self.interval
+                    if self.elected():
+                        update_artifact(artifact=self.root, out_dir=self.root)
+                self.reload()
+            except FileNotFoundError as e:
+                print(f"Not refreshing the current season: {e}")
+            except Exception:
+                print("Refreshing the current season failed:")
+                traceback.print_exc()